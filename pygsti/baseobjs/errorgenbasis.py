@@ -11,13 +11,71 @@ Defines the ElementaryErrorgenBasis class and supporting functionality.
 #***************************************************************************************************
 
 import itertools as _itertools
-import collections as _collections
+from functools import lru_cache as _lru_cache
+
+import numpy as _np
+import scipy.special as _spspecial
 
 from pygsti.baseobjs import Basis as _Basis
 from pygsti.baseobjs.errorgenlabel import GlobalElementaryErrorgenLabel as _GlobalElementaryErrorgenLabel
 from pygsti.tools import optools as _ot
 
 
+def _create_elemgen_matrix(errorgen_type, basis_element_labels, basis_1q):
+    """
+    The (dense, read-only) matrix of an elementary error generator.
+
+    Read-only so that it can be shared among the elements of a basis that only differ by support.
+    """
+    mx = _ot.lindblad_error_generator(errorgen_type, basis_element_labels, basis_1q,
+                                      normalize=True, sparse=False, tensorprod_basis=True)
+    mx.flags.writeable = False
+    return mx
+
+
+def _create_diag_elemgen_matrices(errorgen_type, nontrivial_bels, weight, basis_1q):
+    """
+    The (dense, read-only) matrices of *all* the 'H' or diagonal 'S' elementary error generators of a given weight.
+
+    This is a batched version of :func:`_create_elemgen_matrix` for a complete block of
+    labels, as created by `CompleteElementaryErrorgenBasis._create_diag_labels_for_support`.
+    The matrices don't depend on the support's labels, only on its weight, and they are
+    built together so that the Kronecker factors and the final reordering into a
+    tensor-product basis are shared.  Returns an array of shape `(k**weight, 4**weight, 4**weight)`,
+    where `k = len(nontrivial_bels)`, ordered like the labels.
+    """
+    els = _np.array([basis_1q[bel] for bel in nontrivial_bels])
+    B = els  # kron products of all the weight-`weight` combinations (first factor varies slowest)
+    for _ in range(weight - 1):
+        B = _np.einsum('aij,bkl->abikjl', B, els).reshape(B.shape[0] * els.shape[0],
+                                                           B.shape[1] * els.shape[1], B.shape[2] * els.shape[2])
+    d = B.shape[1]
+    eye = _np.identity(d, B.dtype)
+
+    # superoperators acting on row-major vectorized density matrices, as in lindbladtools
+    if errorgen_type == 'H':  # rho -> -i*sqrt(d)/2 * [B, rho]
+        ret = _np.einsum('aij,kl->aikjl', B, eye) - _np.einsum('ij,alk->aikjl', eye, B)
+        ret = ret.reshape(B.shape[0], d**2, d**2) * (-1j * _np.sqrt(d) / 2)
+    elif errorgen_type == 'S':  # rho -> d * (B rho B^dag - 1/2 {B^dag B, rho})
+        BdagB = _np.einsum('aji,ajk->aik', B.conj(), B)
+        ret = _np.einsum('aij,akl->aikjl', B, B.conj()) \
+            - 0.5 * (_np.einsum('aij,kl->aikjl', BdagB, eye) + _np.einsum('ij,alk->aikjl', eye, BdagB))
+        ret = ret.reshape(B.shape[0], d**2, d**2) * d
+    else:
+        raise ValueError("Invalid elementary error generator type: %s" % str(errorgen_type))
+
+    norms = _np.linalg.norm(ret.reshape(ret.shape[0], -1), axis=1)
+    nonzero = ~_np.isclose(norms, 0)
+    ret[nonzero] /= norms[nonzero, None, None]  # normalize projectors
+
+    # reorder from the "flat" std basis to a tensor product of std bases (see lindblad_error_generator)
+    perm = _np.arange(d**2).reshape((2,) * (2 * weight))
+    perm = perm.transpose([i for q in range(weight) for i in (q, weight + q)]).ravel()
+    ret = _np.ascontiguousarray(ret[:, perm][:, :, perm])
+    ret.flags.writeable = False
+    return ret
+
+
 class ElementaryErrorgenBasis(object):
     """
     A basis for error-generator space defined by a set of elementary error generators.
@@ -40,13 +98,13 @@ class ExplicitElementaryErrorgenBasis(ElementaryErrorgenBasis):
     def __init__(self, state_space, labels, basis1q=None):
         # TODO: docstring - labels must be of form (sslbls, elementary_errorgen_lbl)
         self._labels = tuple(labels) if not isinstance(labels, tuple) else labels
-        self._label_indices = _collections.OrderedDict([(lbl, i) for i, lbl in enumerate(self._labels)])
+        self._label_indices = {lbl: i for i, lbl in enumerate(self._labels)}
         self.basis_1q = basis1q if (basis1q is not None) else _Basis.cast('pp', 4)
 
         self.state_space = state_space
         assert(self.state_space.is_entirely_qubits), "FOGI only works for models containing just qubits (so far)"
         sslbls = self.state_space.tensor_product_block_labels(0)  # all the model's state space labels
-        self.sslbls = sslbls  # the "support" of this space - the qubit labels
+        self._sslbls = sslbls  # the "support" of this space - the qubit labels
         self._cached_elements = None
 
     @property
@@ -57,9 +115,8 @@ class ExplicitElementaryErrorgenBasis(ElementaryErrorgenBasis):
     def elemgen_supports_and_matrices(self):
         if self._cached_elements is None:
             self._cached_elements = tuple(
-                ((elemgen_label.sslbls, _ot.lindblad_error_generator(
-                    elemgen_label.errorgen_type, elemgen_label.basis_element_labels,
-                    self.basis_1q, normalize=True, sparse=False, tensorprod_basis=True))
+                ((elemgen_label.sslbls, _create_elemgen_matrix(
+                    elemgen_label.errorgen_type, elemgen_label.basis_element_labels, self.basis_1q))
                  for elemgen_label in self.labels))
         return self._cached_elements
 
@@ -69,38 +126,51 @@ class ExplicitElementaryErrorgenBasis(ElementaryErrorgenBasis):
         """
         return self._label_indices[label]
 
-    #@property
-    #def sslbls(self):
-    #    """ The support of this errorgen space, e.g., the qubits where its elements may be nontrivial """
-    #    return self.sslbls
+    def label_indices(self, labels):
+        """
+        The indices of the given elementary error generator labels within this basis.
+
+        Parameters
+        ----------
+        labels : iterable
+            The labels to look up.  Each must be an element label of this basis.
+
+        Returns
+        -------
+        list
+            A list of integer indices, one per element of `labels`, in the same order.
+
+        Raises
+        ------
+        KeyError
+            If any of `labels` is not a label of this basis.
+        """
+        # a single pass of dict lookups, without a label_index method call per label
+        return list(map(self._label_indices.__getitem__, labels))
+
+    @property
+    def sslbls(self):
+        """ The support of this errorgen space, e.g., the qubits where its elements may be nontrivial """
+        return self._sslbls
 
     def create_subbasis(self, must_overlap_with_these_sslbls):
         """
         Create a sub-basis of this basis by including only the elements
         that overlap the given support (state space labels)
         """
-        sub_sslbls = set(must_overlap_with_these_sslbls)
-
-        def overlaps(sslbls):
-            ret = len(set(sslbls).intersection(must_overlap_with_these_sslbls)) > 0
-            if ret: sub_sslbls.update(sslbls)  # keep track of all overlaps
-            return ret
-
-        sub_labels, sub_indices = zip(*[(lbl, i) for i, lbl in enumerate(self._labels)
-                                        if overlaps(lbl[0])])
+        overlap = frozenset(must_overlap_with_these_sslbls)
+        sub_labels = [lbl for lbl in self._labels if not overlap.isdisjoint(lbl.sslbls)]
+        sub_sslbls = set(overlap).union(*[lbl.sslbls for lbl in sub_labels])  # keep track of all overlaps
 
         sub_state_space = self.state_space.create_subspace(sub_sslbls)
         return ExplicitElementaryErrorgenBasis(sub_state_space, sub_labels, self.basis_1q)
 
     def union(self, other_basis):
-        present_labels = self._label_indices.copy()  # an OrderedDict, indices don't matter here
+        present_labels = self._label_indices.copy()  # an (ordered) dict, indices don't matter here
         if isinstance(other_basis, ExplicitElementaryErrorgenBasis):
             present_labels.update(other_basis._label_indices)
         else:
-
-            for other_lbl in other_basis.labels:
-                if other_lbl not in present_labels:
-                    present_labels[other_lbl] = True
+            present_labels.update(dict.fromkeys(other_basis.labels))  # new labels are appended in order
 
         union_state_space = self.state_space.union(other_basis.state_space)
         return ExplicitElementaryErrorgenBasis(union_state_space, tuple(present_labels.keys()), self.basis_1q)
@@ -132,37 +202,14 @@ class CompleteElementaryErrorgenBasis(ElementaryErrorgenBasis):
     and with elements corresponding to a `Basis`, usually of Paulis.
     """
 
-    @classmethod
-    def _create_diag_labels_for_support(cls, support, type_str, nontrivial_bels):
-        weight = len(support)
-
-        def _basis_el_strs(possible_bels, wt):
-            for els in _itertools.product(*([possible_bels] * wt)):
-                yield ''.join(els)
+    @staticmethod
+    def _create_diag_labels_for_support(support, type_str, nontrivial_bels):
+        return _create_diag_labels_for_support(tuple(support), type_str, tuple(nontrivial_bels))
 
-        return [_GlobalElementaryErrorgenLabel(type_str, (bel,), support)
-                for bel in _basis_el_strs(nontrivial_bels, weight)]
-
-    @classmethod
-    def _create_all_labels_for_support(cls, support, left_support, type_str, trivial_bel, nontrivial_bels):
-        n = len(support)  # == weight
-        all_bels = trivial_bel + nontrivial_bels
-        left_weight = len(left_support)
-        if len(left_weight) < n:  # n1 < n
-            factors = [nontrivial_bels if x in left_support else trivial_bel for x in support] \
-                + [all_bels if x in left_support else nontrivial_bels for x in support]
-            return [_GlobalElementaryErrorgenLabel(type_str, (''.join(beltup[0:n]), ''.join(beltup[n:])), support)
-                    for beltup in _itertools.product(*factors)]
-            # (factors == left_factors + right_factors above)
-        else:  # n1 == n
-            ret = []
-            for left_beltup in _itertools.product(*([nontrivial_bels] * n)):  # better itertools call here TODO
-                left_bel = ''.join(left_beltup)
-                right_it = _itertools.product(*([all_bels] * n))  # better itertools call here TODO
-                right_it.next()  # advance past first (all I) element - assume trivial el = first!!
-                ret.extend([_GlobalElementaryErrorgenLabel(type_str, (left_bel, ''.join(right_beltup)), support)
-                            for right_beltup in right_it])
-            return ret
+    @staticmethod
+    def _create_all_labels_for_support(support, left_support, type_str, trivial_bel, nontrivial_bels):
+        return _create_all_labels_for_support(tuple(support), tuple(left_support), type_str,
+                                              tuple(trivial_bel), tuple(nontrivial_bels))
 
     @classmethod
     def _create_ordered_labels(cls, type_str, basis_1q, state_space, mode='diagonal',
@@ -175,19 +222,17 @@ class CompleteElementaryErrorgenBasis(ElementaryErrorgenBasis):
         trivial_bel = [basis_1q.labels[0]]
         nontrivial_bels = basis_1q.labels[1:]  # assume first element is identity
 
+        assert(state_space.is_entirely_qubits), "FOGI only works for models containing just qubits (so far)"
+        sslbls = state_space.tensor_product_block_labels(0)  # all the model's state space labels
         if max_weight is None:
-            assert(state_space.is_entirely_qubits), "FOGI only works for models containing just qubits (so far)"
-            sslbls = state_space.tensor_product_block_labels(0)  # all the model's state space labels
             max_weight = len(sslbls)
 
         # Let k be len(nontrivial_bels)
         if mode == "diagonal":
             # --> for each set of n qubit labels, there are k^n Hamiltonian terms with weight n
             for weight in range(1, max_weight + 1):
-                for support in _itertools.combinations(sslbls, weight):  # NOTE: combinations *MUST* be deterministic
-                    if (must_overlap_with_these_sslbls is not None
-                       and len(set(must_overlap_with_these_sslbls).intersection(support)) == 0):
-                        continue
+                # NOTE: combinations *MUST* be deterministic
+                for support in _overlapping_combinations(sslbls, weight, must_overlap_with_these_sslbls):
                     offsets[support] = len(labels)
                     labels.extend(cls._create_diag_labels_for_support(support, type_str, nontrivial_bels))
 
@@ -205,10 +250,7 @@ class CompleteElementaryErrorgenBasis(ElementaryErrorgenBasis):
             #          nNontrivialBELs^(n-n1) * n1QBasisEls^n1 if (n1 < n) else (n1QBasisEls^n - 1)
 
             for weight in range(1, max_weight + 1):
-                for support in _itertools.combinations(sslbls, weight):
-                    if (must_overlap_with_these_sslbls is not None
-                       and len(must_overlap_with_these_sslbls.intersection(support)) == 0):
-                        continue
+                for support in _overlapping_combinations(sslbls, weight, must_overlap_with_these_sslbls):
 
                     for left_weight in range(1, weight + 1):
                         for left_support in _itertools.combinations(support, left_weight):
@@ -232,21 +274,26 @@ class CompleteElementaryErrorgenBasis(ElementaryErrorgenBasis):
         n1Q_nontrivial_bels = n1Q_bels - 1  # assume first element is identity
         total_support = set()
 
+        assert(state_space.is_entirely_qubits), "FOGI only works for models containing just qubits (so far)"
+        sslbls = state_space.tensor_product_block_labels(0)  # all the model's state space labels
         if max_weight is None:
-            assert(state_space.is_entirely_qubits), "FOGI only works for models containing just qubits (so far)"
-            sslbls = state_space.tensor_product_block_labels(0)  # all the model's state space labels
             max_weight = len(sslbls)
 
+        if must_overlap_with_these_sslbls is None and mode in ("diagonal", "all"):
+            # every support is present, so offsets have a closed form - no need to loop over all supports
+            offsets = _SupportOffsets(sslbls, max_weight, mode, n1Q_bels)
+            total_support = set(sslbls) if (max_weight > 0) else set()
+            return (offsets, total_support) if return_total_support else offsets
+
         # Let k be len(nontrivial_bels)
         if mode == "diagonal":
             # --> for each set of n qubit labels, there are k^n Hamiltonian terms with weight n
             for weight in range(1, max_weight + 1):
-                for support in _itertools.combinations(sslbls, weight):  # NOTE: combinations *MUST* be deterministic
-                    if (must_overlap_with_these_sslbls is not None
-                       and len(set(must_overlap_with_these_sslbls).intersection(support)) == 0):
-                        continue
+                block_size = n1Q_nontrivial_bels**weight
+                # NOTE: combinations *MUST* be deterministic
+                for support in _overlapping_combinations(sslbls, weight, must_overlap_with_these_sslbls):
                     offsets[support] = off
-                    off += n1Q_nontrivial_bels**weight
+                    off += block_size
                     total_support.update(support)
 
         elif mode == "all":
@@ -263,17 +310,15 @@ class CompleteElementaryErrorgenBasis(ElementaryErrorgenBasis):
             #          nNontrivialBELs^(n-n1) * n1QBasisEls^n1 if (n1 < n) else (n1QBasisEls^n - 1)
 
             for weight in range(1, max_weight + 1):
-                for support in _itertools.combinations(sslbls, weight):
-                    if (must_overlap_with_these_sslbls is not None
-                       and len(must_overlap_with_these_sslbls.intersection(support)) == 0):
-                        continue
+                for support in _overlapping_combinations(sslbls, weight, must_overlap_with_these_sslbls):
 
                     total_support.update(support)
                     for left_weight in range(1, weight + 1):
                         n, n1 = weight, left_weight
+                        block_size = n1Q_nontrivial_bels**n1 * _right_radices(n1Q_nontrivial_bels, n1Q_bels, n)[n1]
                         for left_support in _itertools.combinations(support, left_weight):
                             offsets[(support, left_support)] = off
-                            off += (n1Q_nontrivial_bels**(n - n1) * n1Q_bels**n1) if (n1 < n) else (n1Q_bels**n - 1)
+                            off += block_size
         else:
             raise ValueError("Invalid mode: %s" % str(mode))
         offsets['END'] = off
@@ -288,6 +333,16 @@ class CompleteElementaryErrorgenBasis(ElementaryErrorgenBasis):
         self._max_ham_weight = max_ham_weight
         self._max_other_weight = max_other_weight
         self._must_overlap_with_these_sslbls = must_overlap_with_these_sslbls
+        self._label_index_cache = {}  # (type, support[, left_support]) => {label: index-within-support-block}
+
+        # With single-character basis element labels, a label's index within its support block is just
+        # its basis-element string read as a mixed-radix number, so label_index needn't enumerate any labels.
+        bels_1q = tuple(self._basis_1q.labels)
+        if all([len(bel) == 1 for bel in bels_1q]):
+            self._bel_digits = {bel: i for i, bel in enumerate(bels_1q)}  # assumes first element is identity
+            self._nontrivial_bel_digits = {bel: i for i, bel in enumerate(bels_1q[1:])}
+        else:
+            self._bel_digits = self._nontrivial_bel_digits = None
 
         assert(self.state_space.is_entirely_qubits), "FOGI only works for models containing just qubits (so far)"
 
@@ -306,17 +361,17 @@ class CompleteElementaryErrorgenBasis(ElementaryErrorgenBasis):
         sslbls = self.state_space.tensor_product_block_labels(0)  # all the model's state space labels
         present_sslbls = hsup.union(ssup)  # set union
         if set(sslbls) == present_sslbls:
-            self.sslbls = sslbls  # the "support" of this space - the qubit labels
+            self._sslbls = sslbls  # the "support" of this space - the qubit labels
         elif present_sslbls.issubset(sslbls):
             self.state_space = self.state_space.create_subspace(present_sslbls)
-            self.sslbls = present_sslbls
+            self._sslbls = present_sslbls
         else:
             # this should never happen - somehow the statespace doesn't have all the labels!
             assert(False), "Logic error! State space doesn't contain all of the present labels!!"
 
-        #FUTURE: cache these for speed?  - but could just create an explicit basis which would be more transparent
-        #self._cached_labels = None
-        #self._cached_elements = None
+        #Note: could just create an explicit basis, but caching here is more lightweight
+        self._cached_labels = None  # this basis is immutable, so labels are built at most once
+        self._cached_elements = None
 
         # Notes on ordering of labels:
         # - let there be k nontrivial 1-qubit basis elements (usually k=3)
@@ -351,21 +406,43 @@ class CompleteElementaryErrorgenBasis(ElementaryErrorgenBasis):
 
     @property
     def labels(self):
-        hlabels = self._create_ordered_labels('H', self._basis_1q, self.state_space,
-                                              'diagonal', self._max_ham_weight,
-                                              self._must_overlap_with_these_sslbls)
-        slabels = self._create_ordered_labels('S', self._basis_1q, self.state_space,
-                                              self._other_mode, self._max_other_weight,
-                                              self._must_overlap_with_these_sslbls)
-        return tuple(hlabels + slabels)
+        if self._cached_labels is None:
+            hlabels = self._create_ordered_labels('H', self._basis_1q, self.state_space,
+                                                  'diagonal', self._max_ham_weight,
+                                                  self._must_overlap_with_these_sslbls)
+            slabels = self._create_ordered_labels('S', self._basis_1q, self.state_space,
+                                                  self._other_mode, self._max_other_weight,
+                                                  self._must_overlap_with_these_sslbls)
+            self._cached_labels = tuple(_itertools.chain(hlabels, slabels))
+        return self._cached_labels
 
     @property
     def elemgen_supports_and_matrices(self):
-        return tuple(((elemgen_label.sslbls,
-                       _ot.lindblad_error_generator(elemgen_label.errorgen_type, elemgen_label.basis_element_labels,
-                                                    self._basis_1q, normalize=True, sparse=False,
-                                                    tensorprod_basis=True))
-                      for elemgen_label in self.labels))
+        if self._cached_elements is None:
+            nontrivial_bels = tuple(self._basis_1q.labels[1:])
+            elements = []
+            mxs_by_key = {}  # matrices don't depend on support labels, so share them among this basis's supports
+            label_blocks = _itertools.groupby(self.labels, lambda lbl: (lbl.errorgen_type, lbl.sslbls))
+            for (elemgen_type, support), lbls in label_blocks:
+                lbls = list(lbls)
+                if (self._nontrivial_bel_digits is not None
+                   and (elemgen_type == 'H' or self._other_mode == 'diagonal')
+                   and len(lbls) == len(nontrivial_bels)**len(support)):
+                    # a complete per-support block (see _create_diag_labels_for_support) - build it all at once
+                    key = (elemgen_type, len(support))
+                    if key not in mxs_by_key:
+                        mxs_by_key[key] = _create_diag_elemgen_matrices(elemgen_type, nontrivial_bels, len(support),
+                                                                        self._basis_1q)
+                    elements.extend([(support, mx) for mx in mxs_by_key[key]])
+                else:
+                    for lbl in lbls:
+                        key = (elemgen_type, lbl.basis_element_labels)
+                        if key not in mxs_by_key:
+                            mxs_by_key[key] = _create_elemgen_matrix(elemgen_type, lbl.basis_element_labels,
+                                                                     self._basis_1q)
+                        elements.append((support, mxs_by_key[key]))
+            self._cached_elements = tuple(elements)
+        return self._cached_elements
 
     def label_index(self, elemgen_label):
         """
@@ -379,26 +456,70 @@ class CompleteElementaryErrorgenBasis(ElementaryErrorgenBasis):
 
         if elemgen_type == 'H' or (elemgen_type == 'S' and self._other_mode == 'diagonal'):
             base = self._h_offsets[support] if (elemgen_type == 'H') else (self._hs_border + self._s_offsets[support])
-            indices = {lbl: i for i, lbl in enumerate(self._create_diag_labels_for_support(support, elemgen_type,
-                                                                                           nontrivial_bels))}
+            if self._nontrivial_bel_digits is not None:
+                return base + self._diag_label_offset(bels[0], len(support))
+
+            cache_key = (elemgen_type, support)
+            indices = self._label_index_cache.get(cache_key, None)
+            if indices is None:
+                indices = {lbl: i for i, lbl in enumerate(self._create_diag_labels_for_support(support, elemgen_type,
+                                                                                               nontrivial_bels))}
+                self._label_index_cache[cache_key] = indices
         elif elemgen_type == 'S':
             assert(self._other_mode == 'all'), "Invalid 'other' mode: %s" % str(self._other_mode)
             assert(len(trivial_bel) == 1)  # assumes this is a single character
-            nontrivial_inds = [i for i, letter in enumerate(bels[0]) if letter != trivial_bel]
-            left_support = tuple([self.sslbls[i] for i in nontrivial_inds])
+            in_left = [letter != trivial_bel for letter in bels[0]]  # scan the left label only once
+            left_support = tuple([sslbl for sslbl, nontriv in zip(support, in_left) if nontriv])
             base = self._hs_border + self._s_offsets[(support, left_support)]
-
-            indices = {lbl: i for i, lbl in enumerate(self._create_all_labels_for_support(
-                support, left_support, 'S', [trivial_bel], nontrivial_bels))}
+            if self._bel_digits is not None:
+                return base + self._all_label_offset(bels[0], bels[1], len(support), in_left)
+
+            cache_key = ('S', support, left_support)
+            indices = self._label_index_cache.get(cache_key, None)
+            if indices is None:
+                indices = {lbl: i for i, lbl in enumerate(self._create_all_labels_for_support(
+                    support, left_support, 'S', [trivial_bel], nontrivial_bels))}
+                self._label_index_cache[cache_key] = indices
         else:
             raise ValueError("Invalid label type: %s" % str(elemgen_type))
 
         return base + indices[elemgen_label]
 
-    #@property
-    #def sslbls(self):
-    #    """ The support of this errorgen space, e.g., the qubits where its elements may be nontrivial """
-    #    return self.sslbls
+    def _diag_label_offset(self, bel, weight):
+        """ Index of a 'diagonal' label with basis-element string `bel` within its support block """
+        if len(bel) != weight:
+            raise KeyError("Basis element label %s doesn't match a support of weight %d" % (bel, weight))
+        k = len(self._nontrivial_bel_digits)
+        offset = 0
+        for letter in bel:  # labels are ordered as itertools.product(nontrivial_bels, ...)
+            offset = offset * k + self._nontrivial_bel_digits[letter]
+        return offset
+
+    def _all_label_offset(self, left_bel, right_bel, weight, in_left):
+        """ Index of an 'all'-mode label (left_bel, right_bel) within its (support, left_support) block """
+        if len(left_bel) != weight or len(right_bel) != weight:
+            raise KeyError("Basis element labels (%s, %s) don't match a support of weight %d"
+                           % (left_bel, right_bel, weight))
+        k = len(self._nontrivial_bel_digits)
+        nbels = len(self._bel_digits)
+        left_offset = right_offset = 0
+        for letter, nontriv in zip(left_bel, in_left):  # trivial positions have a single (radix 1) choice
+            if nontriv: left_offset = left_offset * k + self._nontrivial_bel_digits[letter]
+        for letter, nontriv in zip(right_bel, in_left):
+            right_offset = right_offset * nbels + self._bel_digits[letter] if nontriv \
+                else right_offset * k + self._nontrivial_bel_digits[letter]
+
+        if all(in_left):  # the all-trivial right element is excluded, see _create_all_labels_for_support
+            if right_offset == 0:
+                raise KeyError("Right basis element label cannot be entirely trivial: %s" % right_bel)
+            return left_offset * _right_radices(k, nbels, weight)[weight] + right_offset - 1
+
+        return left_offset * _right_radices(k, nbels, weight)[sum(in_left)] + right_offset
+
+    @property
+    def sslbls(self):
+        """ The support of this errorgen space, e.g., the qubits where its elements may be nontrivial """
+        return self._sslbls
 
     def create_subbasis(self, must_overlap_with_these_sslbls, retain_max_weights=True):
         """
@@ -430,123 +551,216 @@ class CompleteElementaryErrorgenBasis(ElementaryErrorgenBasis):
         return self.to_explicit_basis().difference(other_basis)
 
 
-#OLD - maybe not needed?
-#class LowWeightElementaryErrorgenBasis(ElementaryErrorgenBasis):
-#    """
-#    Spanned by the elementary error generators of given type(s) (e.g. "Hamiltonian" and/or "other")
-#    and with elements corresponding to a `Basis`, usually of Paulis.
-#    """
-#
-#    def __init__(self, basis_1q, state_space, other_mode, max_ham_weight=None, max_other_weight=None,
-#                 must_overlap_with_these_sslbls=None):
-#        self._basis_1q = basis_1q
-#        self._other_mode = other_mode
-#        self.state_space = state_space
-#        self._max_ham_weight = max_ham_weight
-#        self._max_other_weight = max_other_weight
-#        self._must_overlap_with_these_sslbls = must_overlap_with_these_sslbls
-#
-#        assert(self.state_space.is_entirely_qubits), "FOGI only works for models containing just qubits (so far)"
-#        sslbls = self.state_space.tensor_product_block_labels(0)  # all the model's state space labels
-#        self.sslbls = sslbls  # the "support" of this space - the qubit labels
-#
-#        self._cached_label_indices = None
-#        self._cached_labels_by_support = None
-#        self._cached_elements = None
-#
-#        #Needed?
-#        # self.dim = len(self.labels)  # TODO - update this so we don't always need to build labels
-#        # # (this defeats lazy building via property below) - we can just compute this, especially if
-#        # # not too fancy
-#
-#    @property
-#    def labels(self):
-#        if self._cached_label_indices is None:
-#
-#            def _basis_el_strs(possible_bels, wt):
-#                for els in _itertools.product(*([possible_bels] * wt)):
-#                    yield ''.join(els)
-#
-#            labels = {}
-#            all_bels = self.basis_1q.labels[1:]  # assume first element is identity
-#            nontrivial_bels = self.basis_1q.labels[1:]  # assume first element is identity
-#
-#            max_weight = self._max_ham_weight if (self._max_ham_weight is not None) else len(self.sslbls)
-#            for weight in range(1, max_weight + 1):
-#                for support in _itertools.combinations(self.sslbls, weight):
-#                    if (self._must_overlap_with_these_sslbls is not None
-#                       and len(self._must_overlap_with_these_sslbls.intersection(support)) == 0):
-#                        continue
-#                    if support not in labels: labels[support] = []  # always True?
-#                    labels[support].extend([('H', bel) for bel in _basis_el_strs(nontrivial_bels, weight)])
-#
-#            max_weight = self._max_other_weight if (self._max_other_weight is not None) else len(self.sslbls)
-#            if self._other_mode != "all":
-#                for weight in range(1, max_weight + 1):
-#                    for support in _itertools.combinations(self.sslbls, weight):
-#                        if (self._must_overlap_with_these_sslbls is not None
-#                           and len(self._must_overlap_with_these_sslbls.intersection(support)) == 0):
-#                            continue
-#                        if support not in labels: labels[support] = []
-#                        labels[support].extend([('S', bel) for bel in _basis_el_strs(nontrivial_bels, weight)])
-#            else:
-#                #This is messy code that relies on basis labels being single characters -- TODO improve(?)
-#                idle_char = self.basis_1q.labels[1:]  # assume first element is identity
-#                assert(len(idle_char) == 1 and all([len(c) == 1 for c in nontrivial_bels])), \
-#                    "All basis el labels must be single chars for other_mode=='all'!"
-#                for support in _itertools.combinations(self.sslbls, max_weight):
-#                    # Loop over all possible basis elements for this max-weight support, computing the actual support
-#                    # of each one individually and appending it to the appropriate list
-#                    for bel1 in _basis_el_strs(all_bels, max_weight):
-#                        nonidle_indices1 = [i for i in range(max_weight) if bel1[i] != idle_char]
-#                        for bel2 in _basis_el_strs(all_bels, max_weight):
-#                            nonidle_indices2 = [i for i in range(max_weight) if bel2[i] != idle_char]
-#                            nonidle_indices = list(sorted(set(nonidle_indices1) + set(nonidle_indices2)))
-#                            bel1 = ''.join([bel1[i] for i in nonidle_indices])  # trim to actual support
-#                            bel2 = ''.join([bel2[i] for i in nonidle_indices])  # trim to actual support
-#                            actual_support = tuple([support[i] for i in nonidle_indices])
-#
-#                            if (self._must_overlap_with_these_sslbls is not None
-#                               and len(self._must_overlap_with_these_sslbls.intersection(actual_support)) == 0):
-#                                continue
-#
-#                            if actual_support not in labels: labels[actual_support] = []
-#                            labels[actual_support].append(('S', bel1, bel2))
-#
-#            self._cached_labels_by_support = labels
-#            self._cached_label_indices = _collections.OrderedDict(((support_lbl, i) for i, support_lbl in enumerate(
-#                ((support, lbl) for support, lst in labels.items() for lbl in lst))))
-#
-#        return tuple(self._cached_label_indices.keys())
-#
-#    @property
-#    def element_supports_and_matrices(self):
-#        if self._cached_elements is None:
-#            self._cached_elements = tuple(
-#                ((support, _ot.lindblad_error_generator(elemgen_label, self.basis_1q, normalize=True, sparse=False))
-#                 for support, elemgen_label in self.labels))
-#        return self._cached_elements
-#
-#    def element_index(self, label):
-#        """
-#        TODO: docstring
-#        """
-#        if self._cached_label_indices is None:
-#            self.labels  # triggers building of labels
-#        return self._cached_label_indices[label]
-#
-#    @property
-#    def sslbls(self):
-#        """ The support of this errorgen space, e.g., the qubits where its elements may be nontrivial """
-#        return self.sslbls
-#
-#    def create_subbasis(self, must_overlap_with_these_sslbls, retain_max_weights=True):
-#        """
-#        Create a sub-basis of this basis by including only the elements
-#        that overlap the given support (state space labels)
-#        """
-#        #Note: can we reduce self.state_space?
-#        return CompleteErrorgenBasis(self._basis_1q, self.state_space, self._other_mode,
-#                                     self._max_ham_weight if retain_max_weights else None,
-#                                     self._max_other_weight if retain_max_weights else None,
-#                                     self._must_overlap_with_these_sslbls)
+# Label lists only depend on their (hashable) arguments and are rebuilt by every basis with the same
+# state space, so they're cached here (as tuples, since they're shared) rather than per class.
+@_lru_cache(maxsize=2048)
+def _create_diag_labels_for_support(support, type_str, nontrivial_bels):
+    weight = len(support)
+
+    def _basis_el_strs(possible_bels, wt):
+        if all([len(bel) == 1 for bel in possible_bels]):
+            # build all the strings at once: rows of single characters viewed as length-`wt` strings
+            chars = _np.array(possible_bels, dtype='U1')
+            return chars[_digit_grid(len(possible_bels), wt)].view('U%d' % wt).ravel().tolist()
+        return [''.join(els) for els in _itertools.product(*([possible_bels] * wt))]
+
+    return tuple([_GlobalElementaryErrorgenLabel(type_str, (bel,), support)
+                  for bel in _basis_el_strs(nontrivial_bels, weight)])
+
+
+@_lru_cache(maxsize=2048)
+def _create_all_labels_for_support(support, left_support, type_str, trivial_bel, nontrivial_bels):
+    n = len(support)  # == weight
+    all_bels = trivial_bel + nontrivial_bels
+    left_weight = len(left_support)
+    if left_weight < n:  # n1 < n
+        factors = [nontrivial_bels if x in left_support else trivial_bel for x in support] \
+            + [all_bels if x in left_support else nontrivial_bels for x in support]
+        return tuple([_GlobalElementaryErrorgenLabel(type_str, (''.join(beltup[0:n]), ''.join(beltup[n:])), support)
+                      for beltup in _itertools.product(*factors)])
+        # (factors == left_factors + right_factors above)
+    else:  # n1 == n
+        ret = []
+        for left_beltup in _itertools.product(*([nontrivial_bels] * n)):  # better itertools call here TODO
+            left_bel = ''.join(left_beltup)
+            right_it = _itertools.product(*([all_bels] * n))  # better itertools call here TODO
+            next(right_it)  # advance past first (all I) element - assume trivial el = first!!
+            ret.extend([_GlobalElementaryErrorgenLabel(type_str, (left_bel, ''.join(right_beltup)), support)
+                        for right_beltup in right_it])
+        return tuple(ret)
+
+
+def _overlapping_combinations(sslbls, weight, must_overlap_with_these_sslbls):
+    """
+    The supports of `itertools.combinations(sslbls, weight)` that overlap `must_overlap_with_these_sslbls`.
+
+    Supports are returned in the same (deterministic) order as `itertools.combinations`,
+    but only overlapping ones are ever constructed: each is the union of a nonempty
+    combination of the "required" labels (those in `must_overlap_with_these_sslbls`) and a
+    combination of the remaining, "optional", labels.
+
+    Parameters
+    ----------
+    sslbls : tuple
+        The state space labels to choose from.
+
+    weight : int
+        The support size.
+
+    must_overlap_with_these_sslbls : iterable or None
+        The labels that every support must contain at least one of.  If `None`,
+        all the combinations are returned.
+
+    Returns
+    -------
+    iterable of tuples
+    """
+    if must_overlap_with_these_sslbls is None:
+        return _itertools.combinations(sslbls, weight)
+
+    overlap = set(must_overlap_with_these_sslbls)
+    required = tuple([i for i, lbl in enumerate(sslbls) if lbl in overlap])
+    optional = tuple([i for i, lbl in enumerate(sslbls) if lbl not in overlap])
+    support_positions = [tuple(sorted(req + opt))
+                         for r in range(1, min(weight, len(required)) + 1)
+                         for req in _itertools.combinations(required, r)
+                         for opt in _itertools.combinations(optional, weight - r)]
+    support_positions.sort()  # lexicographic order of positions == order of itertools.combinations
+    return [tuple([sslbls[i] for i in pos]) for pos in support_positions]
+
+
+@_lru_cache(maxsize=256)
+def _right_radices(n_nontrivial_bels, n_bels, weight):
+    """
+    The number of right-side basis-element strings paired with each left-side string of an 'all'-mode label block.
+
+    Entry `n1` is for a left support of size `n1` within a support of size `weight`:
+    `k^(weight - n1) * n_bels^n1` when `n1 < weight`, and `n_bels^weight - 1` when
+    `n1 == weight` (the all-trivial right string is excluded), where `k = n_nontrivial_bels`.
+    """
+    return tuple([n_nontrivial_bels**(weight - n1) * n_bels**n1 for n1 in range(weight)] + [n_bels**weight - 1])
+
+
+@_lru_cache(maxsize=32)
+def _digit_grid(base, ndigits):
+    """
+    All `ndigits`-digit numbers in base `base`, as the rows of a (read-only) integer array.
+
+    Rows are ordered just as `itertools.product(range(base), repeat=ndigits)`.
+    """
+    grid = _np.indices((base,) * ndigits).reshape(ndigits, -1).T.copy()
+    grid.flags.writeable = False
+    return grid
+
+
+def _combination_rank(positions, n):
+    """
+    The index of `positions` within `itertools.combinations(range(n), len(positions))`.
+
+    Parameters
+    ----------
+    positions : sequence of int
+        Strictly increasing integers in `[0, n)`.
+
+    n : int
+        The number of items being chosen from.
+
+    Returns
+    -------
+    int
+    """
+    rank = 0
+    r = len(positions)
+    prev = -1
+    for i, p in enumerate(positions):
+        for j in range(prev + 1, p):  # combinations with a smaller i-th element all come first
+            rank += _spspecial.comb(n - 1 - j, r - 1 - i, exact=True)
+        prev = p
+    return rank
+
+
+class _SupportOffsets(object):
+    """
+    Label offsets of *all* the supports of a :class:`CompleteElementaryErrorgenBasis` block.
+
+    A read-only mapping that behaves like the offsets dictionary built by
+    :meth:`CompleteElementaryErrorgenBasis._create_ordered_label_offsets`
+    when no support filtering is applied.  Because every combination of the
+    state space labels (up to `max_weight`) is present in this case, the offset
+    of a support is computed from its lexicographic rank rather than stored.
+
+    Parameters
+    ----------
+    sslbls : tuple
+        All the state space labels.
+
+    max_weight : int
+        The maximum support size.
+
+    mode : {"diagonal", "all"}
+        Whether keys are supports (`"diagonal"`) or `(support, left_support)`
+        tuples (`"all"`).
+
+    n1Q_bels : int
+        The number of 1-qubit basis elements, including the identity.
+    """
+
+    def __init__(self, sslbls, max_weight, mode, n1Q_bels):
+        self._sslbls = tuple(sslbls)
+        self._positions = {lbl: i for i, lbl in enumerate(self._sslbls)}
+        self._max_weight = max_weight
+        self._mode = mode
+        k = n1Q_bels - 1  # assume first element is identity
+        nsslbls = len(self._sslbls)
+
+        self._weight_offsets = [0] * (max_weight + 1)  # offset of the first support of each weight
+        self._support_sizes = [0] * (max_weight + 1)  # number of labels for each support of a given weight
+        self._left_offsets = [None] * (max_weight + 1)  # 'all' mode: offset of each left-weight within a support
+        self._left_sizes = [None] * (max_weight + 1)  # 'all' mode: labels per left-support of each left-weight
+        off = 0
+        for n in range(1, max_weight + 1):
+            self._weight_offsets[n] = off
+            if mode == "diagonal":
+                self._support_sizes[n] = k**n
+            else:
+                left_offsets = [0] * (n + 1)
+                left_sizes = [0] * (n + 1)
+                support_size = 0
+                right_radices = _right_radices(k, n1Q_bels, n)
+                for n1 in range(1, n + 1):
+                    left_offsets[n1] = support_size
+                    left_sizes[n1] = k**n1 * right_radices[n1]
+                    support_size += _spspecial.comb(n, n1, exact=True) * left_sizes[n1]
+                self._left_offsets[n], self._left_sizes[n] = left_offsets, left_sizes
+                self._support_sizes[n] = support_size
+            off += _spspecial.comb(nsslbls, n, exact=True) * self._support_sizes[n]
+        self._end = off
+
+    def _support_positions(self, support, positions):
+        ret = [positions.get(lbl, None) for lbl in support]
+        if any([p is None for p in ret]) or any([ret[i] >= ret[i + 1] for i in range(len(ret) - 1)]):
+            return None  # not a (correctly ordered) combination
+        return ret
+
+    def __getitem__(self, key):
+        if isinstance(key, str) and key == 'END':
+            return self._end
+        support, left_support = key if (self._mode == "all") else (key, None)
+        n = len(support)
+        pos = self._support_positions(support, self._positions) if (1 <= n <= self._max_weight) else None
+        if pos is None: raise KeyError(key)
+        off = self._weight_offsets[n] + _combination_rank(pos, len(self._sslbls)) * self._support_sizes[n]
+        if self._mode == "all":
+            n1 = len(left_support)
+            left_pos = self._support_positions(left_support, {lbl: i for i, lbl in enumerate(support)}) \
+                if (1 <= n1 <= n) else None
+            if left_pos is None: raise KeyError(key)
+            off += self._left_offsets[n][n1] + _combination_rank(left_pos, n) * self._left_sizes[n][n1]
+        return off
+
+    def __contains__(self, key):
+        try:
+            self[key]
+            return True
+        except (KeyError, TypeError, ValueError):
+            return False
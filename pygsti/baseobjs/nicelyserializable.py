@@ -28,6 +28,7 @@ class NicelySerializable(object):
     e.g. JSON.  For example, dictionary keys must be strings, and the list vs. tuple
     distinction cannot be assumed to be preserved during serialization.
     """
+    __slots__ = ()  # so derived classes may use __slots__ (derived classes that don't will have a __dict__)
 
     @classmethod
     def read(cls, path, format=None):
@@ -41,6 +41,8 @@ class CircuitList(_NicelySerializable):
     name : str, optional
         An optional name for this list, used for status messages.
     """
+    __slots__ = ('_circuits', 'op_label_aliases', 'circuit_weights', 'name', '_uuid', '_uuid_hash',
+                 '_aliased_circuits', '__weakref__')  # many transient lists are created, so keep them small
 
     @classmethod
     def cast(cls, circuits):
@@ -83,11 +85,16 @@ class CircuitList(_NicelySerializable):
         name : str, optional
             An optional name for this list, used for status messages.
         """
-        self._circuits = tuple(map(_Circuit.cast, circuits))  # *static* container - can't add/append
+        if isinstance(circuits, tuple) and all([isinstance(c, _Circuit) for c in circuits]):
+            self._circuits = circuits  # already a tuple of Circuits (common when re-wrapping) - no need to copy
+        else:  # only call Circuit.cast on the (usually few) elements that aren't already Circuits
+            self._circuits = tuple([(c if isinstance(c, _Circuit) else _Circuit.cast(c)) for c in circuits])
+        # Note: self._circuits is a *static* container - can't add/append
         self.op_label_aliases = op_label_aliases
         self.circuit_weights = circuit_weights
         self.name = name  # an optional name for this circuit list
-        self.uuid = _uuid.uuid4()  # like a persistent id(), useful for peristent (file) caches
+        self.uuid = None  # like a persistent id(), useful for peristent (file) caches - created when first needed
+        self._aliased_circuits = None  # (op_label_aliases items, aliased circuits) cache used by apply_aliases
 
     def _to_nice_serialization(self):  # memo holds already serialized objects
         assert(self.op_label_aliases is None), "We don't serialize members of op_label_aliases yet."
@@ -127,12 +134,18 @@ class CircuitList(_NicelySerializable):
 
         Returns
         -------
-        list
-            A list of :class:`Circuit`s.
+        tuple
+            A tuple of :class:`Circuit`s.
         """
-        return _lt.apply_aliases_to_circuits(self._circuits, self.op_label_aliases)
-
-    def truncate(self, circuits_to_keep):
+        aliases = self.op_label_aliases
+        if not aliases:
+            return self._circuits  # nothing to apply
+        aliases_key = tuple(aliases.items())  # a snapshot, so in-place changes to the aliases invalidate the cache
+        if self._aliased_circuits is None or self._aliased_circuits[0] != aliases_key:
+            self._aliased_circuits = (aliases_key, tuple(_lt.apply_aliases_to_circuits(self._circuits, aliases)))
+        return self._aliased_circuits[1]
+
+    def truncate(self, circuits_to_keep, keep_weights=False):
         """
         Builds a new circuit list containing only a given subset.
 
@@ -144,16 +157,25 @@ class CircuitList(_NicelySerializable):
         circuits_to_keep : list or set
             The circuits to retain in the returned circuit list.
 
+        keep_weights : bool, optional
+            Whether the circuit weights of the retained circuits are transferred
+            to the returned circuit list.  By default they are not.
+
         Returns
         -------
         CircuitList
         """
-        if isinstance(circuits_to_keep, set):
-            new_circuits = list(filter(lambda c: c in circuits_to_keep, self._circuits))
+        if isinstance(circuits_to_keep, (set, frozenset)):
+            new_circuits = [c for c in self._circuits if c in circuits_to_keep]
         else:
             current_circuits = set(self._circuits)
-            new_circuits = list(filter(lambda c: c in current_circuits, circuits_to_keep))
-        return CircuitList(new_circuits, self.op_label_aliases)  # don't transfer weights or name
+            new_circuits = [c for c in circuits_to_keep if c in current_circuits]
+
+        new_weights = None  # by default, don't transfer weights or name
+        if keep_weights and self.circuit_weights is not None:
+            index_of = {c: i for i, c in enumerate(self._circuits)}
+            new_weights = self.circuit_weights[_np.array([index_of[c] for c in new_circuits], _np.int64)]
+        return CircuitList(new_circuits, self.op_label_aliases, new_weights)
 
     def truncate_to_dataset(self, dataset):
         """
@@ -168,30 +190,73 @@ class CircuitList(_NicelySerializable):
         Returns
         -------
         CircuitList
+            A new circuit list with its own copy of this list's `op_label_aliases`
+            dictionary.  Circuits (which are immutable) are shared, as are any
+            other attributes that a derived class's `truncate` method shares.
         """
-        ret = _copy.deepcopy(self)  # so this works on derived classes too (e.g. PlaquetteGridCircuitStructure)
-        if dataset is None: return ret
+        if dataset is None: return _copy.deepcopy(self)
 
+        # apply aliases and test membership in a single pass (no intermediate aliased list or circuit sets)
+        aliases = self.op_label_aliases
+        if aliases:
+            circuits_in_dataset = [c for c in self._circuits if c.replace_layers_with_aliases(aliases) in dataset]
+        else:
+            circuits_in_dataset = [c for c in self._circuits if c in dataset]
+
+        aliases = dict(aliases) if (aliases is not None) else None  # don't share aliases with this list
+        if type(self) is CircuitList:  # nothing more to preserve, so no need to copy & truncate
+            return CircuitList(circuits_in_dataset, aliases)  # don't transfer weights or name
+
+        # a *shallow* copy suffices since truncate builds a new object (of the derived class) anyway
+        ret = _copy.copy(self)  # so this works on derived classes too (e.g. PlaquetteGridCircuitStructure)
+        ret.uuid = None  # a new (lazily created) identity
         ret.circuit_weights = ret.name = None  # don't transfer weights or name
-        dataset_circuits = set(dataset.keys())
-        circuits_in_dataset = [c for c, aliased_c in zip(self._circuits, self.apply_aliases())
-                               if aliased_c in dataset_circuits]
-        return ret.truncate(circuits_in_dataset)  # uses truncate method, potentially of derived class
+        ret.op_label_aliases = aliases
+        return ret.truncate(circuits_in_dataset)  # uses truncate method of derived class
+
+    @property
+    def uuid(self):
+        """
+        A unique identifier for this circuit list, like a persistent `id()`.
+
+        This is only created when it's first needed (e.g. when this list is
+        hashed, compared, serialized or pickled), since most transient circuit
+        lists never need one.  Setting it to `None` assigns a new identity.
+        """
+        if self._uuid is None:
+            self.uuid = _uuid.uuid4()
+        return self._uuid
+
+    @uuid.setter
+    def uuid(self, value):
+        self._uuid = value
+        self._uuid_hash = hash(value) if (value is not None) else None  # hashed often, e.g. as a cache key
 
     def __hash__(self):
-        if self.uuid is not None:
-            return hash(self.uuid)
-        else:
-            raise TypeError('Use digest hash')
+        if self._uuid_hash is None:
+            return hash(self.uuid)  # creates uuid & caches its hash
+        return self._uuid_hash
 
     def __eq__(self, other):
         #Compare with non-CircuitLists as lists
         if isinstance(other, CircuitList):
-            return self.uuid == other.uuid
-        else:
-            return self._circuits == other
+            return self is other or self.uuid == other.uuid
+        else:  # Note: tuple comparison already checks lengths & element identities before calling Circuit.__eq__
+            return self._circuits is other or self._circuits == other
+
+    def __getstate__(self):
+        self.uuid  # create uuid (if needed) so that copies & unpickled lists share this list's identity
+        state_dict = {k: getattr(self, k) for k in CircuitList.__slots__  # caches are rebuilt by __setstate__
+                      if k not in ('__weakref__', '_uuid_hash', '_aliased_circuits')}
+        state_dict.update(getattr(self, '__dict__', {}))  # attributes of derived classes
+        return state_dict
 
     def __setstate__(self, state_dict):
-        self.__dict__.update(state_dict)
-        if 'uuid' not in state_dict:  # backward compatibility
-            self.uuid = _uuid.uuid4()  # create a new uuid
+        state_dict = state_dict.copy()
+        state_dict.pop('_uuid_hash', None)  # (only present in older pickles)
+        state_dict['_aliased_circuits'] = None  # don't carry over cache
+        if 'uuid' in state_dict:  # backward compatibility: uuid used to be a plain attribute
+            state_dict['_uuid'] = state_dict.pop('uuid')
+        for k, v in state_dict.items():
+            setattr(self, k, v)
+        self.uuid = state_dict.get('_uuid', None)  # a new uuid is created if needed
@@ -800,8 +800,8 @@ class PlaquetteGridCircuitStructure(_CircuitList):
         -------
         PlaquetteGridCircuitStructure
         """
-        xs = self.xs if (xs_to_keep is None) else xs_to_keep
-        ys = self.ys if (ys_to_keep is None) else ys_to_keep
+        xs = _copy.copy(self.xs) if (xs_to_keep is None) else xs_to_keep  # so truncations don't share x & y values
+        ys = _copy.copy(self.ys) if (ys_to_keep is None) else ys_to_keep
 
         plaquettes = _collections.OrderedDict()
         for (x, y), plaq in self._plaquettes.items():
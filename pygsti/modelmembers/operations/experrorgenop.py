@@ -27,6 +27,7 @@ from pygsti.tools import matrixtools as _mt
 IMAG_TOL = 1e-7  # tolerance for imaginary part being considered zero
 MAX_EXPONENT = _np.log(_np.finfo('d').max) - 10.0  # so that exp(.) doesn't overflow
 SPAM_TRANSFORM_TRUNCATE = 1e-4
+EXPM_FRECHET_MIN_DIM = 64  # dimension at/above which scipy's expm_frechet beats the series (3+ qubits)
 
 
 class ExpErrorgenOp(_LinearOperator, _ErrorGeneratorContainer):
@@ -778,8 +779,13 @@ def _d2_exp_series(x, dx, d2x):
 
 def _d_exp_x(x, dx, exp_x=None):
     """
-    Computes the derivative of the exponential of x(t) using
-    the Haddamard lemma series expansion.
+    Computes the derivative of the exponential of x(t).
+
+    Usually this uses the Haddamard lemma series expansion.  When `dx` has a
+    single derivative dimension and `x` is large (dimension at least
+    `EXPM_FRECHET_MIN_DIM`), the Frechet derivative of the matrix exponential
+    is instead computed directly, one parameter at a time, using
+    :func:`scipy.linalg.expm_frechet`, as this is faster for large matrices.
 
     Parameters
     ----------
@@ -795,7 +801,7 @@ def _d_exp_x(x, dx, exp_x=None):
     exp_x : ndarray, optional
         The value of `exp(x)`, which can be specified in order to save
         a call to `scipy.linalg.expm`.  If None, then the value is
-        computed internally.
+        computed internally (when it's needed).
 
     Returns
     -------
@@ -806,6 +812,13 @@ def _d_exp_x(x, dx, exp_x=None):
     tr = len(dx.shape)  # tensor rank of dx; tr-2 == # of derivative dimensions
     assert((tr - 2) in (1, 2)), "Currently, dx can only have 1 or 2 derivative dimensions"
 
+    if tr == 3 and x.shape[0] >= EXPM_FRECHET_MIN_DIM:
+        # Frechet derivative of expm along each parameter direction (scaling & squaring, Al-Mohy & Higham)
+        dExpX = _np.empty(dx.shape, _np.result_type(x, dx))
+        for p in range(dx.shape[2]):
+            dExpX[:, :, p] = _spl.expm_frechet(x, dx[:, :, p], compute_expm=False, check_finite=False)
+        return dExpX
+
     series = _d_exp_series(x, dx)
     if exp_x is None: exp_x = _spl.expm(x)
 
@@ -1468,8 +1468,10 @@ class LindbladErrorgen(_LinearOperator):
             Uinv = s.transform_matrix_inverse
 
             #conjugate Lindbladian exponent by U:
-            err_gen_mx = self.to_sparse() if self._rep_type == 'sparse superop' else self.to_dense()
-            err_gen_mx = _mt.safe_dot(Uinv, _mt.safe_dot(err_gen_mx, U))
+            if self._rep_type == 'sparse superop':
+                err_gen_mx = _mt.safe_dot(Uinv, _mt.safe_dot(self.to_sparse(), U))
+            else:  # all dense, so skip safe_dot's sparsity checks
+                err_gen_mx = Uinv.dot(self.to_dense()).dot(U)
             trunc = bool(isinstance(s, _gaugegroup.UnitaryGaugeGroupElement))
             self._set_params_from_matrix(err_gen_mx, truncate=trunc)
             self.dirty = True
@@ -10,6 +10,8 @@ The LinearlyParamArbitraryOp class and supporting functionality.
 # http://www.apache.org/licenses/LICENSE-2.0 or in the LICENSE file in the root pyGSTi directory.
 #***************************************************************************************************
 
+from functools import lru_cache as _lru_cache
+
 import numpy as _np
 
 from pygsti.modelmembers.operations.denseop import DenseOperator as _DenseOperator
@@ -18,6 +20,17 @@ from pygsti.baseobjs.statespace import StateSpace as _StateSpace
 from pygsti.tools import matrixtools as _mt
 
 IMAG_TOL = 1e-7  # tolerance for imaginary part being considered zero
+MAX_KRON_TRANSFORM_DIM = 16  # largest operation dimension for which a (dim^2, dim^2) derivative transform is stored
+
+
+@_lru_cache(maxsize=32)
+def _identity(dim):
+    """
+    A read-only `dim` x `dim` (real) identity matrix, shared between all the operations that use it.
+    """
+    I = _np.identity(dim, 'd')
+    I.flags.writeable = False
+    return I
 
 
 class LinearlyParameterizedElementTerm(object):
@@ -102,65 +115,130 @@ class LinearlyParamArbitraryOp(_DenseOperator):
     def __init__(self, base_matrix, parameter_array, parameter_to_base_indices_map,
                  left_transform=None, right_transform=None, real=False, evotype="default", state_space=None):
 
-        base_matrix = _np.array(_LinearOperator.convert_to_matrix(base_matrix), 'complex')
-        #complex, even if passed all real base matrix
+        base_matrix = _LinearOperator.convert_to_matrix(base_matrix)
+        all_real = real and _np.isrealobj(base_matrix) and \
+            (left_transform is None or _np.isrealobj(left_transform)) and \
+            (right_transform is None or _np.isrealobj(right_transform))
+        base_matrix = _np.array(base_matrix, 'd' if all_real else 'complex')
+        #complex, even if passed all real base matrix, unless the result is real and computed using only real values
 
-        elementExpressions = {}
+        rows = []; cols = []; pindices = []
         for p, ij_tuples in parameter_to_base_indices_map.items():
             for i, j in ij_tuples:
-                assert((i, j) not in elementExpressions)  # only one parameter allowed per base index pair
-                elementExpressions[(i, j)] = [LinearlyParameterizedElementTerm(1.0, [p])]
+                rows.append(i); cols.append(j); pindices.append(p)
+        assert(len(set(zip(rows, cols))) == len(rows))  # only one parameter allowed per base index pair
 
         typ = "d" if real else "complex"
         mx = _np.empty(base_matrix.shape, typ)
         self.baseMatrix = base_matrix
         self.parameterArray = parameter_array
         self.numParams = len(parameter_array)
-        self.elementExpressions = elementExpressions
         assert(_np.isrealobj(self.parameterArray)), "Parameter array must be real-valued!"
+        self._set_terms(rows, cols, pindices)
 
-        I = _np.identity(self.baseMatrix.shape[0], 'd')  # LinearlyParameterizedGates are currently assumed to be real
+        I = _identity(self.baseMatrix.shape[0])  # LinearlyParameterizedGates are currently assumed to be real
         self.leftTrans = left_transform if (left_transform is not None) else I
         self.rightTrans = right_transform if (right_transform is not None) else I
+        self._left_is_identity = bool(left_transform is None or _np.array_equal(self.leftTrans, I))
+        self._right_is_identity = bool(right_transform is None or _np.array_equal(self.rightTrans, I))
         self.enforceReal = real
 
+        #Left & right transforms act on a (row-major) flattened derivative column as a single
+        # (dim^2, dim^2) matrix.  For large dims this is too big to store, and both are applied separately.
+        if (self._left_is_identity and self._right_is_identity) or self.baseMatrix.shape[0] > MAX_KRON_TRANSFORM_DIM:
+            self._deriv_transform = None
+        else:
+            self._deriv_transform = _np.kron(self.leftTrans, _np.transpose(self.rightTrans))
+        self._deriv_einsum_path = None  # contraction path for applying both transforms without kron (found on demand)
+        self._scratch_mx = _np.empty(self.baseMatrix.shape, self.baseMatrix.dtype)  # work buffers for
+        self._scratch_tmp = _np.empty(self.baseMatrix.shape, self.baseMatrix.dtype)  # _construct_matrix
+
         #Note: dense op reps *always* own their own data so setting writeable flag is OK
         _DenseOperator.__init__(self, mx, evotype, state_space)
         self._ptr.flags.writeable = False  # only _construct_matrix can change array
         self._construct_matrix()  # construct base from the parameters
 
+    def _set_terms(self, rows, cols, pindices):
+        """
+        Set the terms of this operation, stored as parallel ("struct of arrays") term arrays.
+
+        Parameters
+        ----------
+        rows, cols : list
+            The row and column index of the element each term contributes to.
+
+        pindices : list
+            The index of the parameter each term adds to its element.
+
+        Returns
+        -------
+        None
+
+        Notes
+        -----
+        Term `t` adds `params[_term_pidx[t]]` to element `(_term_rows[t], _term_cols[t])`.
+        Each element has at most one term, so the terms are accumulated into the (flattened)
+        matrix at positions `_term_elements` with a single fancy-indexed `+=`.
+        """
+        self._term_rows = _np.array(rows, _np.int32)
+        self._term_cols = _np.array(cols, _np.int32)
+        self._term_pidx = _np.array(pindices, _np.int32)
+        self._term_elements = self._term_rows.astype(_np.int64) * self.baseMatrix.shape[0] + self._term_cols
+        self._deriv_cache = None
+        self._element_expressions = None  # built on demand
+
+    @property
+    def elementExpressions(self):
+        """
+        A dictionary of the terms contributing to each parameterized operation-matrix element.
+
+        Keys are `(i, j)` element indices and values are lists of
+        :class:`LinearlyParameterizedElementTerm` objects.  This is a (read-only)
+        view built from the term arrays which are used internally.
+        """
+        if self._element_expressions is None:
+            self._element_expressions = {(int(i), int(j)): [LinearlyParameterizedElementTerm(1.0, [int(p)])]
+                                         for i, j, p in zip(self._term_rows, self._term_cols, self._term_pidx)}
+        return self._element_expressions
+
     def _construct_matrix(self):
         """
         Build the internal operation matrix using the current parameters.
         """
-        matrix = self.baseMatrix.copy()
-        for (i, j), terms in self.elementExpressions.items():
-            for term in terms:
-                param_prod = _np.prod([self.parameterArray[p] for p in term.paramIndices])
-                matrix[i, j] += term.coeff * param_prod
-        matrix = _np.dot(self.leftTrans, _np.dot(matrix, self.rightTrans))
-
-        if self.enforceReal:
-            if _np.linalg.norm(_np.imag(matrix)) > IMAG_TOL:
+        matrix, tmp = self._scratch_mx, self._scratch_tmp
+        _np.copyto(matrix, self.baseMatrix)
+        matrix.reshape(-1)[self._term_elements] += self.parameterArray[self._term_pidx]
+        if not self._right_is_identity:
+            _np.dot(matrix, self.rightTrans, out=tmp)
+            matrix, tmp = tmp, matrix
+        if not self._left_is_identity:
+            _np.dot(self.leftTrans, matrix, out=tmp)
+            matrix = tmp
+
+        self._set_constructed_matrix(matrix)
+
+    def _set_constructed_matrix(self, matrix):
+        """
+        Sets the internal operation matrix to `matrix`, built from the current parameters.
+        """
+        if self.enforceReal and _np.iscomplexobj(matrix):
+            if _np.max(_np.abs(matrix.imag)) > IMAG_TOL:  # cheaper than a norm, and this test rarely fails
                 raise ValueError("Linearly parameterized matrix has non-zero"
-                                 "imaginary part (%g)!" % _np.linalg.norm(_np.imag(matrix)))
-            matrix = _np.real(matrix)
+                                 "imaginary part (%g)!" % _np.linalg.norm(matrix.imag))
+            matrix = matrix.real
 
         #Note: dense op reps *always* own their own data so setting writeable flag is OK
         assert(matrix.shape == (self.dim, self.dim))
         self._ptr.flags.writeable = True
         self._ptr[:, :] = matrix
         self._ptr.flags.writeable = False
+        self._constructed_params = self.parameterArray.copy()
 
     def _construct_param_to_base_indices_map(self):
         # build mapping for constructor, which has integer keys so ok for serialization
         param_to_base_indices_map = {}
-        for (i, j), term in self.elementExpressions:
-            assert(len(term.paramIndices) == 1)
-            p = term.paramIndices[0]
-            if p not in param_to_base_indices_map:
-                param_to_base_indices_map[p] = []
-            param_to_base_indices_map[p].append((i, j))
+        for i, j, p in zip(self._term_rows, self._term_cols, self._term_pidx):
+            param_to_base_indices_map.setdefault(int(p), []).append((int(i), int(j)))
         return param_to_base_indices_map
 
     def to_memoized_dict(self, mmg_memo):
@@ -261,8 +339,11 @@ class LinearlyParamArbitraryOp(_DenseOperator):
         -------
         None
         """
-        self.parameterArray[:] = v
-        self._construct_matrix()
+        #Note: compare with the parameters the matrix was last built from rather than with
+        # self.parameterArray, which is returned by to_vector() and so may be altered by callers.
+        if not (close and _np.array_equal(v, self._constructed_params)):  # else matrix is up to date
+            _np.copyto(self.parameterArray, v)
+            self._construct_matrix()
         self.dirty = dirty_value
 
     def deriv_wrt_params(self, wrt_filter=None):
@@ -285,26 +366,36 @@ class LinearlyParamArbitraryOp(_DenseOperator):
         numpy array
             Array of derivatives, shape == (dimension^2, num_params)
         """
-        derivMx = _np.zeros((self.numParams, self.dim, self.dim), 'complex')
-        for (i, j), terms in self.elementExpressions.items():
-            for term in terms:
-                params_to_mult = [self.parameterArray[p] for p in term.paramIndices]
-                for k, p in enumerate(term.paramIndices):
-                    param_partial_prod = _np.prod(params_to_mult[0:k] + params_to_mult[k + 1:])  # exclude k-th factor
-                    derivMx[p, i, j] += term.coeff * param_partial_prod
-
-        derivMx = _np.dot(self.leftTrans, _np.dot(derivMx, self.rightTrans))  # (d,d) * (P,d,d) * (d,d) => (d,P,d)
-        derivMx = _np.rollaxis(derivMx, 1, 3)  # now (d,d,P)
-        derivMx = derivMx.reshape([self.dim**2, self.numParams])  # (d^2,P) == final shape
-
-        if self.enforceReal:
-            assert(_np.linalg.norm(_np.imag(derivMx)) < IMAG_TOL)
+        if self._deriv_cache is not None:
+            return self._deriv_cache.view() if (wrt_filter is None) else _np.take(self._deriv_cache, wrt_filter, axis=1)
+            #view because later setting of .shape by caller can mess with self._deriv_cache!
+
+        derivMx = _np.zeros((self.dim**2, self.numParams), self.baseMatrix.dtype)  # (d^2,P) == final shape
+        derivMx.reshape(-1)[self._term_elements * self.numParams + self._term_pidx] = 1.0
+
+        if self._deriv_transform is not None:
+            derivMx = _np.dot(self._deriv_transform, derivMx)
+        elif not (self._left_is_identity and self._right_is_identity):
+            derivMx = derivMx.reshape((self.dim, self.dim, self.numParams))
+            if self._left_is_identity:  # (d,d,P) * (d,d) => (d,d,P)
+                derivMx = _np.transpose(_np.tensordot(derivMx, self.rightTrans, (1, 0)), (0, 2, 1))
+            elif self._right_is_identity:  # (d,d) * (d,d,P) => (d,d,P)
+                derivMx = _np.tensordot(self.leftTrans, derivMx, (1, 0))
+            else:  # (d,d) * (d,d,P) * (d,d) => (d,d,P) in the best contraction order, without extra intermediates
+                if self._deriv_einsum_path is None:
+                    self._deriv_einsum_path = _np.einsum_path('ik,klp,lj->ijp', self.leftTrans, derivMx,
+                                                              self.rightTrans, optimize='optimal')[0]
+                derivMx = _np.einsum('ik,klp,lj->ijp', self.leftTrans, derivMx, self.rightTrans,
+                                     optimize=self._deriv_einsum_path)
+            derivMx = derivMx.reshape([self.dim**2, self.numParams])
+
+        if self.enforceReal and _np.iscomplexobj(derivMx):
+            assert(_np.max(_np.abs(derivMx.imag), initial=0.0) < IMAG_TOL)
             derivMx = _np.real(derivMx)
 
-        if wrt_filter is None:
-            return derivMx
-        else:
-            return _np.take(derivMx, wrt_filter, axis=1)
+        self._deriv_cache = derivMx  # linear in the parameters, so the derivative is constant
+        self._deriv_cache.flags.writeable = False
+        return self.deriv_wrt_params(wrt_filter)
 
     def has_nonzero_hessian(self):
         """
@@ -328,3 +419,73 @@ class LinearlyParamArbitraryOp(_DenseOperator):
                                for term in terms])
             s += "LinearOperator[%d,%d] = %s\n" % (i, j, tStr)
         return s
+
+
+def from_vectors(ops, vectors, close=False, dirty_value=True):
+    """
+    Initialize many :class:`LinearlyParamArbitraryOp` objects, of the same dimension, at once.
+
+    This has the same effect as calling `op.from_vector(v)` for each operation
+    and parameter vector, but builds all the operation matrices together: the
+    parameterized elements of every operation are accumulated by a single
+    scatter into a stacked `(len(ops), dim, dim)` array, and the left & right
+    transforms are applied using a single batched matrix product each.  This
+    is faster than rebuilding each (small) operation matrix separately.
+
+    Parameters
+    ----------
+    ops : list
+        The :class:`LinearlyParamArbitraryOp` objects to initialize.  All must
+        have the same dimension.
+
+    vectors : list
+        The 1D parameter vectors, one per element of `ops`.  The length of
+        each must equal the corresponding operation's `num_params`.
+
+    close : bool, optional
+        Whether each vector is close to its operation's current set of
+        parameters.  As for :meth:`LinearlyParamArbitraryOp.from_vector`,
+        when this is true operations whose matrices are already built from
+        their vector's values are not rebuilt.
+
+    dirty_value : bool, optional
+        The value to set each operation's "dirty flag" to before exiting this
+        call.  Leave this set to `True` unless you know what you're doing.
+
+    Returns
+    -------
+    None
+    """
+    assert(len(ops) == len(vectors)), "There must be one parameter vector per operation!"
+    for op, v in zip(ops, vectors):
+        assert(_np.shape(v) == (op.num_params,)), \
+            "Parameter vector has shape %s but operation has %d parameters!" % (str(_np.shape(v)), op.num_params)
+
+    if close:  # skip operations whose matrix is up to date, as in LinearlyParamArbitraryOp.from_vector
+        stale = []
+        for op, v in zip(ops, vectors):
+            if _np.array_equal(v, op._constructed_params): op.dirty = dirty_value
+            else: stale.append((op, v))
+        ops = [op for op, _ in stale]; vectors = [v for _, v in stale]
+
+    if len(ops) == 0: return
+    dim = ops[0].dim
+    assert(all([op.dim == dim for op in ops])), "All operations must have the same dimension!"
+
+    targets = []; values = []
+    for k, (op, v) in enumerate(zip(ops, vectors)):
+        _np.copyto(op.parameterArray, v)
+        targets.append(op._term_elements + k * dim**2)  # offset into the stacked & flattened matrices
+        values.append(op.parameterArray[op._term_pidx])
+
+    matrices = _np.array([op.baseMatrix for op in ops], _np.result_type(*[op.baseMatrix for op in ops]))
+    matrices.reshape(-1)[_np.concatenate(targets)] += _np.concatenate(values)  # targets are unique
+
+    if not all([op._right_is_identity for op in ops]):
+        matrices = _np.matmul(matrices, _np.array([op.rightTrans for op in ops]))
+    if not all([op._left_is_identity for op in ops]):
+        matrices = _np.matmul(_np.array([op.leftTrans for op in ops]), matrices)
+
+    for op, matrix in zip(ops, matrices):
+        op._set_constructed_matrix(matrix)
+        op.dirty = dirty_value
@@ -56,6 +56,26 @@ class FullPOVMEffect(_ConjugatedStatePOVMEffect):
         self.state.set_dense(vec)
         self.dirty = True
 
+    def set_dense_indices(self, indices, values):
+        """
+        Set a subset of the elements of this POVM effect vector's dense value.
+
+        Parameters
+        ----------
+        indices : array_like
+            Integer indices (into the dense vector) of the elements to set.
+            Non-integer (e.g. boolean) arrays are rejected.
+
+        values : array_like or float
+            The new values of the elements at `indices`.
+
+        Returns
+        -------
+        None
+        """
+        self.state.set_dense_indices(indices, values)
+        self.dirty = True
+
     def depolarize(self, amount):
         """
         Depolarize this effect vector (as though it were a states) by the given `amount`.
@@ -43,6 +43,7 @@ class FullPureState(_DensePureState):
         _DensePureState.__init__(self, purevec, basis, evotype, state_space)
         self._paramlbls = _np.array(["VecElement Re(%d)" % i for i in range(self.state_space.udim)]
                                     + ["VecElement Im(%d)" % i for i in range(self.state_space.udim)], dtype=object)
+        self._deriv = None  # constant, so computed once (on demand)
 
     #REMOVE (Cannot set to arbitrary vector) - but maybe could set to pure vector?
     #def set_dense(self, vec):
@@ -116,7 +117,10 @@ class FullPureState(_DensePureState):
         -------
         None
         """
-        self._ptr[:] = v[0:self.state_space.udim] + 1j * v[self.state_space.udim:]
+        udim = self.state_space.udim
+        ptr = self._ptr
+        ptr.real[:] = v[0:udim]  # write real & imaginary parts in place, so
+        ptr.imag[:] = v[udim:]   # no complex temporaries are created
         self._ptr_has_changed()
         self.dirty = dirty_value
 
@@ -139,12 +143,16 @@ class FullPureState(_DensePureState):
         numpy array
             Array of derivatives, shape == (dimension, num_params)
         """
-        derivMx = _np.concatenate((_np.identity(self.state_space.udim, complex),
-                                   1j * _np.identity(self.state_space.udim, complex)), axis=1)
+        if self._deriv is None:
+            self._deriv = _np.concatenate((_np.identity(self.state_space.udim, complex),
+                                           1j * _np.identity(self.state_space.udim, complex)), axis=1)
+            self._deriv.flags.writeable = False
+
         if wrt_filter is None:
-            return derivMx
+            return self._deriv.view()
+            #view because later setting of .shape by caller can mess with self._deriv!
         else:
-            return _np.take(derivMx, wrt_filter, axis=1)
+            return _np.take(self._deriv, wrt_filter, axis=1)
 
     def has_nonzero_hessian(self):
         """
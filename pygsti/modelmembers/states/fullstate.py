@@ -63,6 +63,37 @@ class FullState(_DenseState):
         self._ptr_has_changed()
         self.dirty = True
 
+    def set_dense_indices(self, indices, values):
+        """
+        Set a subset of the elements of this SPAM vector's dense value.
+
+        Only the elements at `indices` are written, which avoids copying the
+        entire vector when just a few entries change.
+
+        Parameters
+        ----------
+        indices : array_like
+            Integer indices (into the dense vector) of the elements to set.
+            Non-integer (e.g. boolean) arrays are rejected.
+
+        values : array_like or float
+            The new values of the elements at `indices`.
+
+        Returns
+        -------
+        None
+        """
+        indices = _np.asarray(indices)
+        if indices.size == 0:
+            indices = indices.astype(int)
+        elif not _np.issubdtype(indices.dtype, _np.integer):  # e.g. a boolean mask would be read as 0s and 1s
+            raise ValueError("Indices must be integers, not %s" % str(indices.dtype))
+        if indices.size > 0 and (_np.max(indices) >= self.dim or _np.min(indices) < -self.dim):
+            raise ValueError("Indices must be within [0, %d)" % self.dim)
+        self._ptr[indices] = values
+        self._ptr_has_changed()
+        self.dirty = True
+
     @property
     def num_params(self):
         """
@@ -12,6 +12,8 @@ Variables for working with the a model containing X(pi/2) and Z(pi/2) gates.
 
 import sys as _sys
 
+import numpy as _np
+
 from ...circuits import circuitconstruction as _strc
 from ...models import modelconstruction as _setc
 from .. import stdtarget as _stdtarget
@@ -33,23 +35,26 @@ effectStrs = _strc.to_circuits([(),
                                  ('Gx', 'Gx', 'Gx'),
                                  ('Gx', 'Gx', 'Gz', 'Gx')], line_labels=('*',))
 
-germs = _strc.to_circuits(
+germs_lite = _strc.to_circuits(
     [('Gx',),
      ('Gz',),
      ('Gx', 'Gz',),
-     ('Gx', 'Gx', 'Gz'),
-     ('Gx', 'Gz', 'Gz'),
-     ('Gx', 'Gx', 'Gz', 'Gx', 'Gz', 'Gz',)], line_labels=('*',))
-germs_lite = germs[0:4]
-
+     ('Gx', 'Gx', 'Gz')], line_labels=('*',))
 
 germs = _strc.to_circuits([('Gx',), ('Gz',), ('Gz', 'Gx', 'Gx'), ('Gz', 'Gz', 'Gx')], line_labels=('*',))
 
-#Construct a target model:  X(pi/2), Z(pi/2)
-_target_model = _setc.create_explicit_model_from_expressions([('Q0',)], ['Gx', 'Gz'],
-                                                             ["X(pi/2,Q0)", "Z(pi/2,Q0)"])
+_gscache = {}  # populated along with _target_model on first use
 
-_gscache = {("full", "auto"): _target_model}
+
+def __getattr__(name):
+    # Construct the target model, X(pi/2), Z(pi/2), only when it's first needed (PEP 562)
+    if name == '_target_model':
+        mdl = _setc.create_explicit_model_from_expressions([('Q0',)], ['Gx', 'Gz'],
+                                                           ["X(pi/2,Q0)", "Z(pi/2,Q0)"])
+        globals()['_target_model'] = mdl
+        _gscache.setdefault(("full", "auto"), mdl)
+        return mdl
+    raise AttributeError("module %r has no attribute %r" % (__name__, name))
 
 
 def processor_spec():
@@ -106,3 +111,32 @@ pergerm_fidPairsDict_lite = {
     ('Gx', 'Gx', 'Gz'): [
         (0, 0), (0, 2), (1, 1), (4, 0), (4, 2), (5, 5)],
 }
+
+_fidpair_arrays = {}  # germ => array of pergerm_fidPairsDict[germ], built by fid_pair_indices
+_fidpair_arrays_lite = {}  # same, for pergerm_fidPairsDict_lite
+
+
+def fid_pair_indices(germ, lite=False):
+    """
+    Get the per-germ fiducial pairs of `germ` as an integer array.
+
+    Parameters
+    ----------
+    germ : Circuit or tuple
+        A key of `pergerm_fidPairsDict` (or `pergerm_fidPairsDict_lite`).
+
+    lite : bool, optional
+        Whether to use the pairs for the "lite" germ set.
+
+    Returns
+    -------
+    numpy.ndarray
+        A read-only `(nPairs, 2)` array of `(iPrepStr, iEffectStr)` indices.
+    """
+    cache = _fidpair_arrays_lite if lite else _fidpair_arrays
+    if germ not in cache:
+        pairs = (pergerm_fidPairsDict_lite if lite else pergerm_fidPairsDict)[germ]
+        arr = _np.array(pairs, dtype=_np.int8).reshape(-1, 2)  # fiducial indices are < 6
+        arr.flags.writeable = False
+        cache[germ] = arr
+    return cache[germ]
@@ -1738,7 +1738,8 @@ class ExplicitOpModel(_mdl.OpModel):
 
     def setup_fogi(self, initial_gauge_basis, create_complete_basis_fn=None,
                    op_label_abbrevs=None, reparameterize=False, reduce_to_model_space=True,
-                   dependent_fogi_action='drop'):
+                   dependent_fogi_action='drop', check=False):
+        # check: whether the FOGI store runs its (expensive) self-consistency assertions
 
         from pygsti.baseobjs.errorgenbasis import CompleteElementaryErrorgenBasis as _CompleteElementaryErrorgenBasis
         from pygsti.baseobjs.errorgenbasis import ExplicitElementaryErrorgenBasis as _ExplicitElementaryErrorgenBasis
@@ -1865,7 +1866,7 @@ class ExplicitOpModel(_mdl.OpModel):
         self.fogi_store = _FOGIStore(gauge_action_matrices, gauge_action_gauge_spaces,
                                      errorgen_coefficient_labels,  # gauge_errgen_space_labels,
                                      op_label_abbrevs, reduce_to_model_space, dependent_fogi_action,
-                                     norm_order=norm_order)
+                                     norm_order=norm_order, check=check)
 
         if reparameterize:
             self.param_interposer = self._add_reparameterization(
@@ -11,17 +11,38 @@ Defines the FirstOrderGaugeInvariantStore class and supporting functionality.
 #***************************************************************************************************
 
 import numpy as _np
+import scipy.linalg as _spl
 import scipy.sparse as _sps
-import copy as _copy
 import warnings as _warnings
 import itertools as _itertools
 import collections as _collections
+from functools import lru_cache as _lru_cache
 from pygsti.baseobjs import Basis as _Basis
 from pygsti.tools import matrixtools as _mt
 from pygsti.tools import optools as _ot
 from pygsti.tools import fogitools as _fogit
 
 
+def _pinv(a, rcond=1e-15, overwrite_a=False):
+    """
+    The pseudo-inverse of `a`, like `numpy.linalg.pinv` (singular values below `rcond * max(s)` are dropped).
+
+    Uses `scipy.linalg.svd` directly, so that when `overwrite_a` is True the
+    (potentially large) input isn't defensively copied.
+    """
+    if a.size == 0:
+        return _np.zeros(a.shape[::-1], a.dtype)
+    u, s, vh = _spl.svd(a, full_matrices=False, overwrite_a=overwrite_a, lapack_driver='gesdd')
+    large = s > rcond * s[0]  # singular values are in descending order
+    return _np.dot(vh[large].conjugate().T / s[large], u[:, large].conjugate().T)
+
+
+@_lru_cache(maxsize=4096)
+def _nonidentity_positions(bel_lbl):
+    """ The positions (within the label's support) where a basis-element label string is not 'I' """
+    return tuple([i for i, char in enumerate(bel_lbl) if char != 'I'])
+
+
 class FirstOrderGaugeInvariantStore(object):
     """
     An object that computes and stores the first-order-gauge-invariant quantities of a model.
@@ -31,9 +52,17 @@ class FirstOrderGaugeInvariantStore(object):
 
     def __init__(self, gauge_action_matrices_by_op, gauge_action_gauge_spaces_by_op, errorgen_coefficient_labels_by_op,
                  op_label_abbrevs=None, reduce_to_model_space=True,
-                 dependent_fogi_action='drop', norm_order=None):
+                 dependent_fogi_action='drop', norm_order=None, check=False):
         """
         TODO: docstring
+
+        Parameters
+        ----------
+        check : bool, optional
+            Whether to assert that the computed FOGI directions are gauge invariant and
+            linearly independent (when `dependent_fogi_action == 'drop'`), and that the FOGV
+            directions are orthogonal.  These checks need pseudo-inverses of potentially
+            large matrices, so they are off by default.
         """
 
         self.primitive_op_labels = tuple(gauge_action_matrices_by_op.keys())
@@ -85,7 +114,7 @@ class FirstOrderGaugeInvariantStore(object):
             op_elemgen_lbls = orig_gauge_space.elemgen_basis.labels
             W = common_gauge_space.vectors[common_gauge_space.elemgen_basis.label_indices(op_elemgen_lbls), :]
             V = orig_gauge_space.vectors
-            alpha = _np.dot(_np.linalg.pinv(V), W)  # make SPARSE compatible in future if space vectors are sparse
+            alpha = _np.dot(_pinv(V), W)  # make SPARSE compatible in future if space vectors are sparse
             alpha = _sps.csr_matrix(alpha)  # convert to dense -> CSR for now, as if we did sparse math above
 
             # update gauge action to use common gauge space
@@ -125,10 +154,11 @@ class FirstOrderGaugeInvariantStore(object):
         #                    for nm in _fogit.elem_vec_names(gauge_space_directions, gauge_elemgen_labels)]
 
         #Get gauge-space directions corresponding to the fogv directions
-        # (pinv_allop_gauge_action takes errorgen-set -> gauge-gen space)
+        # (pinv(allop_gauge_action) takes errorgen-set -> gauge-gen space; the least-squares solution below is
+        #  the same thing applied to the fogv directions, without forming the pseudo-inverse explicitly)
         self.allop_gauge_action = allop_gauge_action
-        pinv_allop_gauge_action = _np.linalg.pinv(self.allop_gauge_action.toarray(), rcond=1e-7)
-        gauge_space_directions = _np.dot(pinv_allop_gauge_action, self.fogv_directions)  # in gauge-generator space
+        gauge_space_directions = _np.linalg.lstsq(self.allop_gauge_action.toarray(), self.fogv_directions.toarray(),
+                                                  rcond=1e-7)[0]  # in gauge-generator space
         self.gauge_space_directions = gauge_space_directions
 
         #Notes on error-gen vs gauge-gen space:
@@ -144,9 +174,13 @@ class FirstOrderGaugeInvariantStore(object):
         #Store auxiliary info for later use
         self.norm_order = norm_order
         self._dependent_fogi_action = dependent_fogi_action
+        self._pinv_directions_T = {}  # cached pseudo-inverses used to convert components -> errorgen-set vecs
+        self._directions_T = {}  # cached transposed directions (as CSR matrices) used to project errorgen-set vecs
+        self._errorgen_vec_scratch = None  # reused by _opcoeffs_to_errorgen_vec
 
-        #Assertions to check that everything looks good
-        if True:
+        #Assertions to check that everything looks good - these need several pseudo-inverses (SVDs) of
+        # potentially large matrices, so they're only run when asked for.
+        if check:
             fogi_dirs = self.fogi_directions.toarray()  # don't bother with sparse math yet
             fogv_dirs = self.fogv_directions.toarray()
 
@@ -162,13 +196,13 @@ class FirstOrderGaugeInvariantStore(object):
 
             if dependent_fogi_action == 'drop':
                 #assert(_mt.columns_are_orthogonal(self.fogi_directions))  # not true unless we construct them so...
-                assert(_np.linalg.norm(_np.dot(fogi_dirs.T, _np.linalg.pinv(fogi_dirs.T))
+                assert(_np.linalg.norm(_np.dot(fogi_dirs.T, _pinv(fogi_dirs.T))
                                        - _np.identity(fogi_dirs.shape[1], 'd')) < 1e-6)
 
             # A similar relationship should always hold for the gauge directions, except for these we never
             #  keep linear dependencies
             assert(_mt.columns_are_orthogonal(fogv_dirs))
-            assert(_np.linalg.norm(_np.dot(fogv_dirs.T, _np.linalg.pinv(fogv_dirs.T))
+            assert(_np.linalg.norm(_np.dot(fogv_dirs.T, _pinv(fogv_dirs.T))
                                    - _np.identity(fogv_dirs.shape[1], 'd')) < 1e-6)
 
     def find_nice_fogiv_directions(self):
@@ -235,57 +269,95 @@ class FirstOrderGaugeInvariantStore(object):
         else: labels = [''] * len(self.fogv_labels)
         return tuple(labels)
 
+    def _dirs_T(self, typ):
+        """ The transposed fogi ('fogi'), fogv ('fogv') or stacked fogi-then-fogv ('fogiv') directions, as CSR """
+        # The (sparse) direction matrices are stored in whatever format they were built in, e.g. COO, and
+        # transposing one on each call costs more than the product.  Row-compressed transposes give fast products.
+        if typ not in self._directions_T:
+            if typ == 'fogi':
+                dirs = self.fogi_directions
+            elif typ == 'fogv':
+                dirs = self.fogv_directions
+            else:  # 'fogiv'
+                dirs = _sps.hstack((self.fogi_directions, self.fogv_directions))
+            dirs_T = _sps.csr_matrix(dirs.transpose())
+
+            # directions computed as (dense) nullspaces are stored with all their roundoff-level elements, so drop
+            # these to make the projections O(number of significant elements)
+            dirs_T.data[_np.abs(dirs_T.data) < 1e-12] = 0
+            dirs_T.eliminate_zeros()
+            self._directions_T[typ] = dirs_T
+        return self._directions_T[typ]
+
     def errorgen_vec_to_fogi_components_array(self, errorgen_vec):
-        fogi_coeffs = self.fogi_directions.transpose().dot(errorgen_vec)
+        fogi_coeffs = self._dirs_T('fogi').dot(errorgen_vec)
         assert(_np.linalg.norm(fogi_coeffs.imag) < 1e-8)
         return fogi_coeffs.real
 
     def errorgen_vec_to_fogv_components_array(self, errorgen_vec):
-        fogv_coeffs = self.fogv_directions.transpose().dot(errorgen_vec)
+        fogv_coeffs = self._dirs_T('fogv').dot(errorgen_vec)
         assert(_np.linalg.norm(fogv_coeffs.imag) < 1e-8)
         return fogv_coeffs.real
 
+    def _opcoeffs_to_errorgen_vec(self, op_coeffs):
+        # each op's coefficients fill a contiguous block (slice) of errgen-set space, so fill them op by op.  These
+        # blocks cover the whole space, so a scratch vector can be reused (the caller only needs it transiently)
+        if self._errorgen_vec_scratch is None:
+            self._errorgen_vec_scratch = _np.empty(self.errorgen_space_dim, 'd')
+        errorgen_vec = self._errorgen_vec_scratch
+        for op_label in self.primitive_op_labels:
+            coeffs = op_coeffs[op_label]
+            elem_lbls = self.elem_errorgen_labels_by_op[op_label]
+            errorgen_vec[self.op_errorgen_indices[op_label]] = [coeffs.get(elem_lbl, 0.0) for elem_lbl in elem_lbls]
+        return errorgen_vec
+
     def opcoeffs_to_fogi_components_array(self, op_coeffs):
-        errorgen_vec = _np.zeros(self.errorgen_space_dim, 'd')
-        for i, (op_label, elem_lbl) in enumerate(self.errorgen_space_op_elem_labels):
-            errorgen_vec[i] += op_coeffs[op_label].get(elem_lbl, 0.0)
+        errorgen_vec = self._opcoeffs_to_errorgen_vec(op_coeffs)
         return self.errorgen_vec_to_fogi_components_array(errorgen_vec)
 
     def opcoeffs_to_fogv_components_array(self, op_coeffs):
-        errorgen_vec = _np.zeros(self.errorgen_space_dim, 'd')
-        for i, (op_label, elem_lbl) in enumerate(self.errorgen_space_op_elem_labels):
-            errorgen_vec[i] += op_coeffs[op_label].get(elem_lbl, 0.0)
+        errorgen_vec = self._opcoeffs_to_errorgen_vec(op_coeffs)
         return self.errorgen_vec_to_fogv_components_array(errorgen_vec)
 
     def opcoeffs_to_fogiv_components_array(self, op_coeffs):
-        errorgen_vec = _np.zeros(self.errorgen_space_dim, 'd')
-        for i, (op_label, elem_lbl) in enumerate(self.errorgen_space_op_elem_labels):
-            errorgen_vec[i] += op_coeffs[op_label].get(elem_lbl, 0.0)
-        return self.errorgen_vec_to_fogi_components_array(errorgen_vec), \
-            self.errorgen_vec_to_fogv_components_array(errorgen_vec)
+        errorgen_vec = self._opcoeffs_to_errorgen_vec(op_coeffs)
+        coeffs = self._dirs_T('fogiv').dot(errorgen_vec)  # project onto both sets of directions with one product
+        fogi_coeffs, fogv_coeffs = coeffs[0:self.num_fogi_directions], coeffs[self.num_fogi_directions:]
+        assert(_np.linalg.norm(fogi_coeffs.imag) < 1e-8)
+        assert(_np.linalg.norm(fogv_coeffs.imag) < 1e-8)
+        return fogi_coeffs.real, fogv_coeffs.real
+
+    def _pinv_dirs_T(self, typ):
+        """ The pseudo-inverse of the transposed fogi ('fogi'), fogv ('fogv') or combined ('fogiv') directions """
+        # The directions are fixed after construction, so each (expensive, SVD-based) pseudo-inverse is computed once.
+        if typ not in self._pinv_directions_T:
+            # DENSE - need to use sparse solve to enact sparse pinv on vector TODO
+            if typ == 'fogi':
+                dirs = self.fogi_directions.toarray()
+            elif typ == 'fogv':
+                dirs = self.fogv_directions.toarray()
+            else:  # 'fogiv'
+                dirs = _np.concatenate((self.fogi_directions.toarray(), self.fogv_directions.toarray()), axis=1)
+            self._pinv_directions_T[typ] = _pinv(dirs.T, rcond=1e-7, overwrite_a=True)  # dirs is our own copy
+        return self._pinv_directions_T[typ]
 
     def fogi_components_array_to_errorgen_vec(self, fogi_components):
         assert(self._dependent_fogi_action == 'drop'), \
             ("Cannot convert *from* fogi components to an errorgen-set vec when fogi directions are linearly-dependent!"
              "  (Set `dependent_fogi_action='drop'` to ensure directions are independent.)")
-        # DENSE - need to use sparse solve to enact sparse pinv on vector TODO
-        return _np.dot(_np.linalg.pinv(self.fogi_directions.toarray().T, rcond=1e-7), fogi_components)
+        return _np.dot(self._pinv_dirs_T('fogi'), fogi_components)
 
     def fogv_components_array_to_errorgen_vec(self, fogv_components):
         assert(self._dependent_fogi_action == 'drop'), \
             ("Cannot convert *from* fogv components to an errorgen-set vec when fogi directions are linearly-dependent!"
              "  (Set `dependent_fogi_action='drop'` to ensure directions are independent.)")
-        # DENSE - need to use sparse solve to enact sparse pinv on vector TODO
-        return _np.dot(_np.linalg.pinv(self.fogv_directions.toarray().T, rcond=1e-7), fogv_components)
+        return _np.dot(self._pinv_dirs_T('fogv'), fogv_components)
 
     def fogiv_components_array_to_errorgen_vec(self, fogi_components, fogv_components):
         assert(self._dependent_fogi_action == 'drop'), \
             ("Cannot convert *from* fogiv components to an errorgen-set vec when fogi directions are "
              "linearly-dependent!  (Set `dependent_fogi_action='drop'` to ensure directions are independent.)")
-        # DENSE - need to use sparse solve to enact sparse pinv on vector TODO
-        return _np.dot(_np.linalg.pinv(
-            _np.concatenate((self.fogi_directions.toarray(), self.fogv_directions.toarray()), axis=1).T,
-            rcond=1e-7), _np.concatenate((fogi_components, fogv_components)))
+        return _np.dot(self._pinv_dirs_T('fogiv'), _np.concatenate((fogi_components, fogv_components)))
 
     def errorgen_vec_to_opcoeffs(self, errorgen_vec):
         op_coeffs = {op_label: {} for op_label in self.primitive_op_labels}
@@ -315,35 +387,38 @@ class FirstOrderGaugeInvariantStore(object):
         dict
         """
 
-        # Construct a dict of information for each elementary error-gen basis element (the basis for error-gen space)
-        elemgen_info = {}
-        for k, (op_label, eglabel) in enumerate(self.errorgen_space_op_elem_labels):
-            elemgen_info[k] = {
-                'type': eglabel[0],
-                'qubits': set([i for bel_lbl in eglabel[1:] for i, char in enumerate(bel_lbl) if char != 'I']),
-                'op_label': op_label,
-                'elemgen_label': eglabel,
-            }
+        # Gather information for each elementary error-gen basis element (the basis for error-gen space), one
+        # sequence per field so that the elements contributing to a FOGI quantity can be aggregated field by field
+        elemgen_op_labels = [op_label for op_label, _ in self.errorgen_space_op_elem_labels]
+        elemgen_types = [eglabel.errorgen_type for _, eglabel in self.errorgen_space_op_elem_labels]
+        elemgen_qubits = []  # the qubits acted upon, i.e. where some basis element is non-identity
+        for _, eglabel in self.errorgen_space_op_elem_labels:
+            positions = set().union(*[_nonidentity_positions(bel_lbl) for bel_lbl in eglabel.basis_element_labels])
+            support = getattr(eglabel, 'sslbls', None)  # global labels' basis elements are relative to their support
+            elemgen_qubits.append(frozenset([support[i] for i in positions] if (support is not None) else positions))
+
+        # work with the directions' nonzero elements, column by column
+        fogi_dirs = self.fogi_directions.tocsc(copy=True)
+        fogi_dirs.sum_duplicates()
 
         bins = {}
         dependent_indices = set(self.dependent_dir_indices)  # indices of one set of linearly dep. fogi dirs
         for i, meta in enumerate(self.fogi_metadata):
-            fogi_dir = self.fogi_directions[:, i].toarray()
+            fogi_dir = fogi_dirs[:, i].toarray()
+            fogi_dir.flags.writeable = False  # may be shared by the infos of merged bins
             label = meta['name']
             label_raw = meta['raw']
             label_abbrev = meta['abbrev']
             gauge_dir = meta['gaugespace_dir']
             r_factor = meta['r']
 
-            present_elgen_indices = _np.where(_np.abs(fogi_dir) > tol)[0]
+            nz = slice(fogi_dirs.indptr[i], fogi_dirs.indptr[i + 1])
+            present_elgen_indices = fogi_dirs.indices[nz][_np.abs(fogi_dirs.data[nz]) > tol]
 
-            #Aggregate elemgen_info data for all elemgens that contribute to this FOGI qty (as determined by `tol`)
-            ops_involved = set(); qubits_acted_upon = set(); types = set()  # basismx = None
-            for k in present_elgen_indices:
-                k_info = elemgen_info[k]
-                ops_involved.add(k_info['op_label'])
-                qubits_acted_upon.update(k_info['qubits'])
-                types.add(k_info['type'])
+            #Aggregate elemgen info for all elemgens that contribute to this FOGI qty (as determined by `tol`)
+            ops_involved = set([elemgen_op_labels[k] for k in present_elgen_indices])
+            types = set([elemgen_types[k] for k in present_elgen_indices])
+            qubits_acted_upon = set().union(*[elemgen_qubits[k] for k in present_elgen_indices])
 
             #Create the "info" dictionary for this FOGI quantity
             info = {'op_set': ops_involved,
@@ -388,20 +463,17 @@ class FirstOrderGaugeInvariantStore(object):
         dict
             The merged dictionary
         """
-        def _merge_into(dest, src, offset, nlevels_to_merge, store_index):
-            if nlevels_to_merge == 0:  # special last-level case where src and dest are *lists*
-                for info in src:
-                    new_info = _copy.deepcopy(info)
-                    new_info['fogi_index'] += offset
-                    new_info['store_index'] = store_index
-                    dest.append(new_info)
-            else:
-                for k, d in src.items():
-                    if k not in dest: dest[k] = {} if (nlevels_to_merge > 1) else []  # last level = list
-                    _merge_into(dest[k], d, offset, nlevels_to_merge - 1, store_index)
-
-        bins = {}
-        nLevels = 3  # ops_involved, types, qubits_acted_upon
+        bins = {}  # levels: ops_involved, types, qubits_acted_upon (see create_binned_fogi_infos)
         for i, (sub_bins, offset) in enumerate(zip(binned_fogi_infos, index_offsets)):
-            _merge_into(bins, sub_bins, offset, nLevels, i)
+            for ops_involved, bins_by_types in sub_bins.items():
+                dest_by_types = bins.setdefault(ops_involved, {})
+                for types, bins_by_qubits in bins_by_types.items():
+                    dest_by_qubits = dest_by_types.setdefault(types, {})
+                    for qubits_acted_upon, infos in bins_by_qubits.items():
+                        dest = dest_by_qubits.setdefault(qubits_acted_upon, [])
+                        for info in infos:
+                            new_info = dict(info)  # shallow: the (read-only) direction arrays needn't be copied
+                            new_info['fogi_index'] = info['fogi_index'] + offset
+                            new_info['store_index'] = i
+                            dest.append(new_info)
         return bins
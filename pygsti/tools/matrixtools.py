@@ -184,7 +184,9 @@ def nullspace(m, tol=1e-7):
     -------
     An matrix of shape (M,K) whose columns contain nullspace basis vectors.
     """
-    _, s, vh = _np.linalg.svd(m)
+    # Only the right singular vectors are needed, so the (potentially huge) full set of left singular
+    # vectors of a tall matrix needn't be computed: vh is complete whenever M >= N.
+    _, s, vh = _np.linalg.svd(m, full_matrices=(m.shape[0] < m.shape[1]))
     rank = (s > tol).sum()
     return vh[rank:].T.copy()
 
@@ -443,7 +445,7 @@ def independent_columns(m, initial_independent_cols=None, tol=1e-7):
 
     else:  # sparse case
 
-        from scipy.sparse.linalg.eigen.arpack.arpack import ArpackNoConvergence as _ArpackNoConvergence
+        from scipy.sparse.linalg import ArpackNoConvergence as _ArpackNoConvergence
         running_indep_cols = initial_independent_cols.copy() \
             if (initial_independent_cols is not None) else _sps.csc_matrix((m.shape[0], 0), dtype=m.dtype)
         num_indep_cols = running_indep_cols.shape[0]
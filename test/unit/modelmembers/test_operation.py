@@ -1,9 +1,12 @@
 import pickle
+from unittest import mock
 
 import numpy as np
+import scipy.linalg
 import scipy.sparse as sps
 
 import pygsti.modelmembers.operations as op
+import pygsti.modelmembers.operations.experrorgenop as experrorgenop
 import pygsti.tools.internalgates as itgs
 import pygsti.tools.optools as gt
 from pygsti.models.modelconstruction import create_spam_vector, create_operation
@@ -415,6 +418,47 @@ class LinearlyParamOpTester(MutableDenseOpBase, BaseCase):
         deriv = gate_linear_B.deriv_wrt_params()
         # TODO assert correctness
 
+    def test_element_expressions(self):
+        baseMx = np.zeros((4, 4))
+        parameterToBaseIndicesMap = {0: [(0, 0), (2, 3)], 1: [(1, 1)]}
+        gate = op.LinearlyParamArbitraryOp(baseMx, np.array([2.0, 3.0]), parameterToBaseIndicesMap, real=True)
+        self.assertEqual(sorted(gate.elementExpressions.keys()), [(0, 0), (1, 1), (2, 3)])
+        self.assertEqual(gate.elementExpressions[(2, 3)][0].paramIndices, [0])
+        self.assertEqual(gate._construct_param_to_base_indices_map(), parameterToBaseIndicesMap)
+
+        mm_dict = gate.to_memoized_dict({})
+        gate2 = op.LinearlyParamArbitraryOp._from_memoized_dict(mm_dict, {})
+        self.assertArraysAlmostEqual(gate2.to_dense(), gate.to_dense())
+
+    def test_from_vectors(self):
+        from pygsti.modelmembers.operations.lpdenseop import from_vectors
+        rng = np.random.RandomState(0)
+        parameterToBaseIndicesMap = {0: [(0, 0), (2, 3)], 1: [(1, 1)]}
+        gates = [op.LinearlyParamArbitraryOp(rng.rand(4, 4), np.zeros(2), parameterToBaseIndicesMap, real=True),
+                 op.LinearlyParamArbitraryOp(rng.rand(4, 4), np.zeros(2), parameterToBaseIndicesMap,
+                                             rng.rand(4, 4), rng.rand(4, 4), real=True)]
+        gate_copies = [g.copy() for g in gates]
+        vecs = [rng.rand(2), rng.rand(2)]
+
+        from_vectors(gates, vecs)
+        for g, gcopy, v in zip(gates, gate_copies, vecs):
+            gcopy.from_vector(v)
+            self.assertArraysAlmostEqual(g.to_dense(), gcopy.to_dense())
+            self.assertArraysAlmostEqual(g.to_vector(), v)
+
+        #close=True only rebuilds the operations whose parameters changed
+        new_vecs = [vecs[0].copy(), rng.rand(2)]
+        with mock.patch.object(gates[0], '_set_constructed_matrix') as set0, \
+                mock.patch.object(gates[1], '_set_constructed_matrix', wraps=gates[1]._set_constructed_matrix) as set1:
+            from_vectors(gates, new_vecs, close=True)
+        set0.assert_not_called()
+        set1.assert_called_once()
+        gate_copies[1].from_vector(new_vecs[1])
+        self.assertArraysAlmostEqual(gates[1].to_dense(), gate_copies[1].to_dense())
+
+        with self.assertRaises(AssertionError):
+            from_vectors(gates, [rng.rand(2), rng.rand(3)])
+
 
 class TPOpTester(MutableDenseOpBase, BaseCase):
     n_params = 12
@@ -843,3 +887,24 @@ class DepolarizeOpTester(BaseCase):
         rho = create_spam_vector("0", "Q0", Basis.cast("pp", [4]))
         # b/c both X and Y dephasing rates => 0.01 reduction
         self.assertAlmostEqual(float(np.dot(rho.T, np.dot(dop.to_dense(), rho))), 0.98)
+
+
+class ExpErrorgenDerivTester(BaseCase):
+    @staticmethod
+    def _finite_diff_deriv(x, dx, eps=1e-7):
+        expm = scipy.linalg.expm
+        return np.stack([(expm(x + eps * dx[:, :, p]) - expm(x - eps * dx[:, :, p])) / (2 * eps)
+                         for p in range(dx.shape[2])], axis=2)
+
+    def test_d_exp_x_method_crossover(self):
+        # The series expansion is used below EXPM_FRECHET_MIN_DIM, expm_frechet at and above it.
+        min_dim = experrorgenop.EXPM_FRECHET_MIN_DIM
+        rs = np.random.RandomState(1234)
+        for dim, expect_frechet in ((min_dim - 1, False), (min_dim, True)):
+            x = rs.randn(dim, dim) * 0.05
+            dx = rs.randn(dim, dim, 3)
+            with mock.patch.object(experrorgenop._spl, 'expm_frechet',
+                                   wraps=scipy.linalg.expm_frechet) as frechet:
+                dexp = experrorgenop._d_exp_x(x, dx, scipy.linalg.expm(x))
+            self.assertEqual(frechet.called, expect_frechet)
+            self.assertArraysAlmostEqual(dexp, self._finite_diff_deriv(x, dx))
@@ -1,3 +1,4 @@
+import copy
 import pickle
 
 import numpy as np
@@ -197,6 +198,28 @@ class FullStateTester(MutableDenseStateBase, BaseCase):
         with self.assertRaises(ValueError):
             states.convert(self.vec, "foobar", basis)
 
+    def test_set_dense_indices(self):
+        v = self.vec.to_dense().copy()
+        v[[1, 3]] = [0.25, 0.5]
+        self.vec.set_dense_indices([1, 3], [0.25, 0.5])
+        self.assertArraysAlmostEqual(self.vec.to_dense(), v)
+        self.assertArraysAlmostEqual(self.vec.to_vector(), v)
+
+        effect = povms.FullPOVMEffect(v, 'default', state_space=None)
+        effect.set_dense_indices([0], 0.75)
+        v[0] = 0.75
+        self.assertArraysAlmostEqual(effect.to_dense(), v)
+        with self.assertRaises(ValueError):
+            effect.set_dense_indices([4], 1.0)
+
+        #boolean masks & float indices are rejected rather than read as integer indices
+        with self.assertRaises(ValueError):
+            self.vec.set_dense_indices(np.array([True, False, False, True]), 0.0)
+        with self.assertRaises(ValueError):
+            effect.set_dense_indices([1.0], 0.0)
+        self.vec.set_dense_indices([], [])
+        self.assertArraysAlmostEqual(self.vec.to_dense()[[1, 3]], [0.25, 0.5])
+
 
 class TPStateTester(MutableDenseStateBase, BaseCase):
     n_params = 3
@@ -309,6 +332,25 @@ class ComplementPOVMEffectTester(POVMEffectBase, BaseCase):
             self.vec.to_vector()
 
 
+class UnconstrainedPOVMTester(BaseCase):
+    def setUp(self):
+        v = np.array([1, 0, 0, 1], 'd') / np.sqrt(2)
+        self.povm = UnconstrainedPOVM([('0', povms.FullPOVMEffect(v, 'default', state_space=None)),
+                                       ('1', povms.FullPOVMEffect(v[::-1].copy(), 'default', state_space=None))])
+        bounds = np.zeros((4, 2), 'd'); bounds[:, 0] = -1.0; bounds[:, 1] = 1.0
+        self.povm['0'].parameter_bounds = bounds
+
+    def test_pickle_and_deepcopy_preserve_effect_state(self):
+        for povm in (pickle.loads(pickle.dumps(self.povm)), copy.deepcopy(self.povm)):
+            self.assertEqual(list(povm.keys()), ['0', '1'])
+            for lbl in ('0', '1'):
+                self.assertEqual(type(povm[lbl]), type(self.povm[lbl]))
+                self.assertArraysAlmostEqual(povm[lbl].to_dense(), self.povm[lbl].to_dense())
+            self.assertArraysAlmostEqual(povm['0'].parameter_bounds, self.povm['0'].parameter_bounds)
+            self.assertIsNone(povm['1'].parameter_bounds)
+            self.assertEqual(list(povm['0'].parameter_labels), list(self.povm['0'].parameter_labels))
+
+
 class TensorProdStateBase(StateBase):
 
     def test_copy(self):
@@ -1,5 +1,10 @@
+import importlib.util
+import sys
+from unittest import mock
+
 from pygsti.circuits.circuitconstruction import to_circuits
 from pygsti.modelpacks import smq1Q_XYZI, smq2Q_XYICPHASE
+from pygsti.modelpacks.legacy import std1Q_XZ
 from ..util import BaseCase
 
 
@@ -40,3 +45,36 @@ class Modelpack2QTester(ModelpackBase, BaseCase):
          (('Gxpi2', 10), ('Gxpi2', 10), ('Gxpi2', 11)), (('Gxpi2', 10), ('Gxpi2', 10), ('Gypi2', 11)),
          (('Gxpi2', 10), ('Gxpi2', 10), ('Gxpi2', 11), ('Gxpi2', 11))], line_labels=[10, 11]
     )
+
+
+class LegacyStd1QXZTester(BaseCase):
+    def test_fid_pair_indices(self):
+        for lite, pairs_dict in ((False, std1Q_XZ.pergerm_fidPairsDict), (True, std1Q_XZ.pergerm_fidPairsDict_lite)):
+            for germ, pairs in pairs_dict.items():
+                indices = std1Q_XZ.fid_pair_indices(germ, lite)
+                self.assertEqual([tuple(p) for p in indices.tolist()], pairs)
+                self.assertFalse(indices.flags.writeable)
+                self.assertIs(std1Q_XZ.fid_pair_indices(germ, lite), indices)  # cached
+
+        with self.assertRaises(KeyError):
+            std1Q_XZ.fid_pair_indices(('Gx', 'Gz'))  # only a "lite" germ
+
+    def test_lazy_target_model(self):
+        # load a fresh copy of the module, since the shared one may have already built its target model
+        name = 'pygsti.modelpacks.legacy._fresh_std1Q_XZ'
+        spec = importlib.util.spec_from_file_location(name, std1Q_XZ.__file__)
+        fresh = importlib.util.module_from_spec(spec)
+        with mock.patch.dict(sys.modules, {name: fresh}):
+            spec.loader.exec_module(fresh)
+            self.assertNotIn('_target_model', vars(fresh))
+            self.assertEqual(fresh._gscache, {})
+
+            mdl = fresh.target_model()  # builds the target model on first use
+            self.assertIn('_target_model', vars(fresh))
+            self.assertIn(('full', 'auto'), fresh._gscache)
+            self.assertEqual(list(mdl.operations.keys()), ['Gx', 'Gz'])
+            self.assertArraysAlmostEqual(mdl.operations['Gx'].to_dense(),
+                                         std1Q_XZ.target_model().operations['Gx'].to_dense())
+
+            with self.assertRaises(AttributeError):
+                fresh.not_an_attribute
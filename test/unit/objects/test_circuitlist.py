@@ -0,0 +1,61 @@
+import pickle
+
+import numpy as np
+
+from pygsti.circuits import Circuit, CircuitList
+from pygsti.data import DataSet
+from ..util import BaseCase
+
+
+class CircuitListTester(BaseCase):
+    def setUp(self):
+        self.circuits = [Circuit('GxGy'), Circuit('Gx'), Circuit('Gy'), Circuit('GyGy')]
+        self.clist = CircuitList(self.circuits, circuit_weights=np.array([1.0, 2.0, 3.0, 4.0]), name='test')
+
+    def test_hash_and_pickle(self):
+        self.assertEqual(hash(self.clist), hash(self.clist.uuid))
+        clist = pickle.loads(pickle.dumps(self.clist))
+        self.assertEqual(clist, self.clist)
+        self.assertEqual(hash(clist), hash(self.clist))
+
+        self.clist.apply_aliases()  # caches aren't part of the pickled state
+        state = self.clist.__getstate__()
+        self.assertNotIn('_uuid_hash', state)
+        self.assertNotIn('_aliased_circuits', state)
+
+    def test_truncate(self):
+        trunc = self.clist.truncate({Circuit('Gy'), Circuit('GxGy')})
+        self.assertEqual(list(trunc), [Circuit('GxGy'), Circuit('Gy')])
+        self.assertIsNone(trunc.circuit_weights)
+
+        trunc = self.clist.truncate([Circuit('GyGy'), Circuit('Gz'), Circuit('Gx')], keep_weights=True)
+        self.assertEqual(list(trunc), [Circuit('GyGy'), Circuit('Gx')])
+        self.assertArraysAlmostEqual(trunc.circuit_weights, np.array([4.0, 2.0]))
+
+    def test_truncate_to_dataset(self):
+        ds = DataSet(outcome_labels=['0', '1'])
+        ds.add_count_dict(Circuit('Gx'), {'0': 5, '1': 5})
+        ds.add_count_dict(Circuit('GxGxGx'), {'0': 5, '1': 5})
+        ds.done_adding_data()
+
+        trunc = self.clist.truncate_to_dataset(ds)
+        self.assertEqual(list(trunc), [Circuit('Gx')])
+        self.assertIsNone(trunc.name)
+
+        aliased = CircuitList(self.circuits, op_label_aliases={'Gy': Circuit('GxGx')})
+        aliased_trunc = aliased.truncate_to_dataset(ds)
+        self.assertEqual(list(aliased_trunc), [Circuit('GxGy'), Circuit('Gx')])
+        self.assertEqual(aliased_trunc.op_label_aliases, aliased.op_label_aliases)
+        self.assertIsNot(aliased_trunc.op_label_aliases, aliased.op_label_aliases)
+
+    def test_apply_aliases(self):
+        self.assertEqual(tuple(self.clist.apply_aliases()), tuple(self.circuits))
+
+        aliases = {'Gy': Circuit('GxGx')}
+        clist = CircuitList(self.circuits, op_label_aliases=aliases)
+        aliased = clist.apply_aliases()
+        self.assertIsInstance(aliased, tuple)
+        self.assertEqual(aliased, (Circuit('GxGxGx'), Circuit('Gx'), Circuit('GxGx'), Circuit('GxGxGxGx')))
+
+        aliases['Gy'] = Circuit('Gz')  # modifying the aliases in place must not give stale results
+        self.assertEqual(clist.apply_aliases(), (Circuit('GxGz'), Circuit('Gx'), Circuit('Gz'), Circuit('GzGz')))
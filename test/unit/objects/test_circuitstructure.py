@@ -25,6 +25,23 @@ class LSGermsStructureTester(BaseCase):
         self.assertEqual(truncy.used_xs, ['x1', 'x2'])
         self.assertEqual(truncy.used_ys, ['y1'])
 
+    def test_truncate_to_dataset(self):
+        from pygsti.data import DataSet
+        ds = DataSet(outcome_labels=['0', '1'])
+        ds.add_count_dict(Circuit('GxGx'), {'0': 5, '1': 5})
+        ds.done_adding_data()
+
+        gss = cs.PlaquetteGridCircuitStructure(self.gss._plaquettes, self.xvals, self.yvals, 'xlabel', 'ylabel',
+                                               op_label_aliases={'Gy': Circuit('Gx')})
+        trunc = gss.truncate_to_dataset(ds)
+        self.assertIsInstance(trunc, cs.PlaquetteGridCircuitStructure)
+        self.assertEqual(len(trunc), len(gss))
+        self.assertEqual(trunc.op_label_aliases, gss.op_label_aliases)
+        self.assertIsNot(trunc.op_label_aliases, gss.op_label_aliases)
+        self.assertEqual(trunc.xs, gss.xs)
+        self.assertIsNot(trunc.xs, gss.xs)
+        self.assertIsNot(trunc.ys, gss.ys)
+
     def test_xvals(self):
         self.assertEqual(self.gss.xs, self.xvals)
 
@@ -0,0 +1,75 @@
+import itertools
+
+from pygsti.baseobjs import errorgenbasis as egb
+from pygsti.baseobjs.basis import Basis
+from pygsti.baseobjs.statespace import QubitSpace
+from pygsti.tools import optools as ot
+from ..util import BaseCase
+
+
+class DiagElemgenMatricesTester(BaseCase):
+    def test_matches_lindblad_error_generator(self):
+        basis_1q = Basis.cast('pp', 4)
+        nontrivial_bels = tuple(basis_1q.labels[1:])
+        for typ in ('H', 'S'):
+            for weight in (1, 2, 3):
+                mxs = egb._create_diag_elemgen_matrices(typ, nontrivial_bels, weight, basis_1q)
+                bels = [''.join(t) for t in itertools.product(nontrivial_bels, repeat=weight)]
+                self.assertEqual(mxs.shape, (len(bels), 4**weight, 4**weight))
+                for mx, bel in zip(mxs, bels):
+                    expected = ot.lindblad_error_generator(typ, (bel,), basis_1q, normalize=True,
+                                                           sparse=False, tensorprod_basis=True)
+                    self.assertArraysAlmostEqual(mx, expected)
+
+
+class CompleteElementaryErrorgenBasisIndexTester(BaseCase):
+    def setUp(self):
+        self.basis_1q = Basis.cast('pp', 4)
+
+    def _check_offsets(self, mode, nqubits, must_overlap):
+        state_space = QubitSpace(nqubits)
+        _, expected = egb.CompleteElementaryErrorgenBasis._create_ordered_labels(
+            'S', self.basis_1q, state_space, mode, None, must_overlap, include_offsets=True)
+        offsets = egb.CompleteElementaryErrorgenBasis._create_ordered_label_offsets(
+            'S', self.basis_1q, state_space, mode, None, must_overlap)
+        for key, off in expected.items():
+            self.assertTrue(key in offsets)
+            self.assertEqual(offsets[key], off)
+
+        sslbls = state_space.tensor_product_block_labels(0)
+        for weight in range(1, nqubits + 1):
+            for support in itertools.permutations(sslbls, weight):  # includes out-of-order (absent) supports
+                keys = [support] if mode == 'diagonal' else \
+                    [(support, left) for n1 in range(1, weight + 1) for left in itertools.permutations(support, n1)]
+                for key in keys:
+                    self.assertEqual(key in offsets, key in expected)
+
+    def test_offsets(self):
+        for mode in ('diagonal', 'all'):
+            for nqubits in (1, 2, 3):
+                for must_overlap in (None, (0,)):
+                    self._check_offsets(mode, nqubits, must_overlap)
+
+    def test_support_offsets_are_computed(self):
+        offsets = egb.CompleteElementaryErrorgenBasis._create_ordered_label_offsets(
+            'S', self.basis_1q, QubitSpace(3), 'all')
+        self.assertIsInstance(offsets, egb._SupportOffsets)
+        with self.assertRaises(KeyError):
+            offsets[((1, 0), (1,))]
+
+    def test_label_index(self):
+        for mode in ('diagonal', 'all'):
+            for nqubits in (1, 2, 3):
+                for must_overlap in (None, (0,)):
+                    eb = egb.CompleteElementaryErrorgenBasis(self.basis_1q, QubitSpace(nqubits), mode,
+                                                             must_overlap_with_these_sslbls=must_overlap)
+                    labels = eb.labels
+                    self.assertEqual(len(labels), len(eb))
+                    for i, lbl in enumerate(labels):
+                        self.assertEqual(eb.label_index(lbl), i)
+
+    def test_combination_rank(self):
+        for n in range(1, 6):
+            for r in range(1, n + 1):
+                for i, positions in enumerate(itertools.combinations(range(n), r)):
+                    self.assertEqual(egb._combination_rank(positions, n), i)
@@ -1,3 +1,5 @@
+from unittest import mock
+
 import numpy as np
 
 import pygsti.models.explicitmodel as mdl
@@ -153,3 +155,74 @@ class ExplicitOpModelToolTester(BaseCase):
             self.model.depolarize(op_noise=0.1, max_op_noise=0.1, spam_noise=0)  # can't specify both
         with self.assertRaises(ValueError):
             self.model.depolarize(spam_noise=0.1, max_spam_noise=0.1)  # can't specify both
+
+
+class ExplicitOpModelFOGITester(BaseCase):
+    def setUp(self):
+        from pygsti.baseobjs import Basis
+        from pygsti.baseobjs.errorgenbasis import CompleteElementaryErrorgenBasis
+        from pygsti.modelpacks import smq1Q_XY
+        self.model = smq1Q_XY.target_model('H+s')
+        self.gauge_basis = CompleteElementaryErrorgenBasis(Basis.cast('pp', 4), self.model.state_space, 'diagonal')
+
+    def test_setup_fogi(self):
+        self.model.setup_fogi(self.gauge_basis, None, None, reparameterize=True, dependent_fogi_action='drop')
+        fogi_store = self.model.fogi_store
+        self.assertEqual(fogi_store.num_fogi_directions, 12)
+        self.assertEqual(fogi_store.num_fogv_directions, 12)
+        self.assertEqual(len(self.model.fogi_errorgen_component_labels()), 12)
+        self.assertEqual(self.model.num_params, 12)
+
+        # FOGI and FOGV directions together span the whole error generator space
+        all_dirs = np.concatenate((fogi_store.fogi_directions.toarray(), fogi_store.fogv_directions.toarray()), axis=1)
+        self.assertEqual(np.linalg.matrix_rank(all_dirs), 24)
+
+        # the reparameterized model's parameters are its FOGI components
+        v = np.random.RandomState(1234).randn(self.model.num_params) * 0.01
+        self.model.from_vector(v)
+        self.assertArraysAlmostEqual(self.model.fogi_errorgen_components_array(), v)
+
+    def test_setup_fogi_check(self):
+        from pygsti.models import fogistore
+        unchecked = self.model.copy()
+        with mock.patch.object(fogistore._mt, 'columns_are_orthogonal',
+                               wraps=fogistore._mt.columns_are_orthogonal) as orthog_check:
+            unchecked.setup_fogi(self.gauge_basis, None, None, dependent_fogi_action='drop')
+            num_unchecked_calls = orthog_check.call_count
+            orthog_check.reset_mock()
+            self.model.setup_fogi(self.gauge_basis, None, None, dependent_fogi_action='drop', check=True)
+            self.assertGreater(orthog_check.call_count, num_unchecked_calls)  # the checks were run (and passed)
+        self.assertArraysAlmostEqual(self.model.fogi_store.fogi_directions.toarray(),
+                                     unchecked.fogi_store.fogi_directions.toarray())
+
+    def test_binned_fogi_infos_qubits(self):
+        from pygsti.baseobjs import Basis, Label
+        from pygsti.baseobjs.errorgenbasis import CompleteElementaryErrorgenBasis
+        from pygsti.modelpacks import smq2Q_XYCNOT
+        model = smq2Q_XYCNOT.target_model('H+s')
+        for lbl in list(model.operations.keys()):
+            if lbl not in (Label('Gxpi2', 0), Label('Gxpi2', 1)): del model.operations[lbl]
+        gauge_basis = CompleteElementaryErrorgenBasis(Basis.cast('pp', 4), model.state_space, 'diagonal')
+        model.setup_fogi(gauge_basis, None, None, reparameterize=False, dependent_fogi_action='drop')
+        bins = model.fogi_store.create_binned_fogi_infos()
+
+        # qubits are state space labels (not positions within an elementary error generator's support)
+        gx0, gx1, povm = Label('Gxpi2', 0), Label('Gxpi2', 1), Label('Mdefault')
+        self.assertEqual(set(bins[(gx0, povm)][('H',)].keys()), {(0,), (0, 1)})
+        self.assertEqual(set(bins[(gx1, povm)][('H',)].keys()), {(1,), (0, 1)})
+        for ops in [(gx0,), (gx1,)]:
+            for types in [('H',), ('S',)]:
+                self.assertEqual(set(bins[ops][types].keys()), {(0,), (1,), (0, 1)})
+
+        elem_labels = model.fogi_store.errorgen_space_op_elem_labels
+        for bins_by_types in bins.values():
+            for bins_by_qubits in bins_by_types.values():
+                for qubits, infos in bins_by_qubits.items():
+                    for info in infos:
+                        self.assertEqual(tuple(sorted(info['qubits'])), qubits)
+                        expected = set()
+                        for k in np.where(np.abs(info['fogi_dir']) > 1e-5)[0]:
+                            eglabel = elem_labels[k][1]
+                            expected.update([eglabel.sslbls[i] for bel in eglabel.basis_element_labels
+                                             for i, char in enumerate(bel) if char != 'I'])
+                        self.assertEqual(info['qubits'], expected)
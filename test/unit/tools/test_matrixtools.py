@@ -65,6 +65,16 @@ class MatrixToolsTester(BaseCase):
 
         #mt.print_mx(a)
 
+    def test_nullspace_rectangular(self):
+        np.random.seed(1234)
+        tall = np.dot(np.random.randn(50, 3), np.random.randn(3, 5))  # rank 3, so 2 null vectors
+        wide = tall.T  # rank 3, so 47 null vectors
+        for m, nulldim in ((tall, 2), (wide, 47)):
+            ns = mt.nullspace(m)
+            self.assertEqual(ns.shape, (m.shape[1], nulldim))
+            self.assertArraysAlmostEqual(np.dot(m, ns), np.zeros((m.shape[0], nulldim)))
+            self.assertArraysAlmostEqual(np.dot(ns.T, ns), np.identity(nulldim))
+
     def test_matrix_log(self):
         M = np.array([[-1, 0], [0, -1]], 'complex')  # degenerate negative evals
         logM = mt.real_matrix_log(M, action_if_imaginary="raise", tol=1e-6)